@@ -0,0 +1,51 @@
+"""Add composite and partial indexes for analytics and listing queries
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-16 00:00:00
+
+Databases created by Base.metadata.create_all() already carry these
+indexes, so every index is created with IF NOT EXISTS.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "0001"
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _where(column: str, value: bool) -> dict:
+    clause = sa.column(column, sa.Boolean) == (sa.true() if value else sa.false())
+    return {"sqlite_where": clause, "postgresql_where": clause}
+
+
+INDEXES = [
+    ("ix_sales_date_id", "sales", ["date", "id"], {}),
+    ("ix_sales_customer_date", "sales", ["customer_id", "date"], {}),
+    ("ix_sales_product_date", "sales", ["product_id", "date"], {}),
+    ("ix_sales_paid_date", "sales", ["is_fully_paid", "date"], {}),
+    ("ix_sales_unpaid_customer", "sales", ["customer_id", "date"], _where("is_fully_paid", False)),
+    ("ix_purchases_date_id", "purchases", ["date", "id"], {}),
+    ("ix_purchases_supplier_date", "purchases", ["supplier_id", "date"], {}),
+    ("ix_purchases_product_date", "purchases", ["product_id", "date"], {}),
+    ("ix_payments_date_id", "payments", ["date", "id"], {}),
+    ("ix_payments_customer_date", "payments", ["customer_id", "date"], {}),
+    ("ix_payments_sale_id", "payments", ["sale_id"], {}),
+    ("ix_products_active_id", "products", ["is_active", "id"], {}),
+    ("ix_products_active_stock", "products", ["stock_qty", "min_stock_level"], _where("is_active", True)),
+]
+
+
+def upgrade() -> None:
+    for name, table, columns, kwargs in INDEXES:
+        op.create_index(name, table, columns, if_not_exists=True, **kwargs)
+
+
+def downgrade() -> None:
+    for name, table, _, _ in reversed(INDEXES):
+        op.drop_index(name, table_name=table, if_exists=True)
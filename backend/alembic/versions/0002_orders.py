@@ -0,0 +1,80 @@
+"""Add multi-line orders and let payments target an order
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-16 00:00:00
+
+Base.metadata.create_all() may already have created the new tables on
+startup, so they are only created when missing.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "0002"
+down_revision: Union[str, None] = "0001"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+    tables = inspector.get_table_names()
+
+    if "orders" not in tables:
+        unpaid = sa.column("is_fully_paid", sa.Boolean) == sa.false()
+        op.create_table(
+            "orders",
+            sa.Column("id", sa.Integer(), primary_key=True),
+            sa.Column("customer_id", sa.Integer(), sa.ForeignKey("customers.id"), nullable=False),
+            sa.Column("user_id", sa.Integer(), sa.ForeignKey("users.id"), nullable=True),
+            sa.Column("total_amount", sa.Float(), nullable=False),
+            sa.Column("paid_amount", sa.Float(), nullable=True),
+            sa.Column("is_fully_paid", sa.Boolean(), nullable=True),
+            sa.Column("profit", sa.Float(), nullable=False),
+            sa.Column("notes", sa.Text(), nullable=True),
+            sa.Column("date", sa.Date(), nullable=False),
+            sa.Column("created_at", sa.DateTime(), nullable=True),
+        )
+        op.create_index("ix_orders_id", "orders", ["id"])
+        op.create_index("ix_orders_date_id", "orders", ["date", "id"])
+        op.create_index("ix_orders_customer_date", "orders", ["customer_id", "date"])
+        op.create_index(
+            "ix_orders_unpaid_customer", "orders", ["customer_id", "date"],
+            sqlite_where=unpaid, postgresql_where=unpaid
+        )
+
+    if "order_lines" not in tables:
+        op.create_table(
+            "order_lines",
+            sa.Column("id", sa.Integer(), primary_key=True),
+            sa.Column("order_id", sa.Integer(), sa.ForeignKey("orders.id"), nullable=False),
+            sa.Column("product_id", sa.Integer(), sa.ForeignKey("products.id"), nullable=False),
+            sa.Column("qty", sa.Integer(), nullable=False),
+            sa.Column("selling_price", sa.Float(), nullable=False),
+            sa.Column("total_amount", sa.Float(), nullable=False),
+            sa.Column("profit", sa.Float(), nullable=False),
+        )
+        op.create_index("ix_order_lines_id", "order_lines", ["id"])
+        op.create_index("ix_order_lines_order_id", "order_lines", ["order_id"])
+        op.create_index("ix_order_lines_product_id", "order_lines", ["product_id"])
+
+    payment_columns = {c["name"] for c in inspector.get_columns("payments")}
+    with op.batch_alter_table("payments") as batch_op:
+        batch_op.alter_column("sale_id", existing_type=sa.Integer(), nullable=True)
+        if "order_id" not in payment_columns:
+            batch_op.add_column(sa.Column("order_id", sa.Integer(), nullable=True))
+            batch_op.create_foreign_key("fk_payments_order_id", "orders", ["order_id"], ["id"])
+    op.create_index("ix_payments_order_id", "payments", ["order_id"], if_not_exists=True)
+
+
+def downgrade() -> None:
+    op.drop_index("ix_payments_order_id", table_name="payments", if_exists=True)
+    with op.batch_alter_table("payments") as batch_op:
+        batch_op.drop_constraint("fk_payments_order_id", type_="foreignkey")
+        batch_op.drop_column("order_id")
+        batch_op.alter_column("sale_id", existing_type=sa.Integer(), nullable=False)
+    op.drop_table("order_lines")
+    op.drop_table("orders")
@@ -0,0 +1,52 @@
+"""Add the financial_totals ledger and the daily_sales_rollup table
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-17 00:00:00
+
+Both tables used to come only from Base.metadata.create_all() on app startup,
+so they are only created when missing. They start empty; the app fills them
+from the sales, purchases and orders tables on startup (or run
+`python manage.py rebuild-ledger` and `python manage.py rebuild-rollup`).
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "0005"
+down_revision: Union[str, None] = "0004"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    tables = sa.inspect(op.get_bind()).get_table_names()
+
+    if "financial_totals" not in tables:
+        op.create_table(
+            "financial_totals",
+            sa.Column("id", sa.Integer(), primary_key=True),
+            sa.Column("total_revenue", sa.Float(), nullable=False),
+            sa.Column("total_expenses", sa.Float(), nullable=False),
+            sa.Column("net_profit", sa.Float(), nullable=False),
+            sa.Column("outstanding_receivables", sa.Float(), nullable=False),
+            sa.Column("updated_at", sa.DateTime(), nullable=True),
+        )
+        op.create_index("ix_financial_totals_id", "financial_totals", ["id"])
+
+    if "daily_sales_rollup" not in tables:
+        op.create_table(
+            "daily_sales_rollup",
+            sa.Column("date", sa.Date(), primary_key=True),
+            sa.Column("revenue", sa.Float(), nullable=False),
+            sa.Column("profit", sa.Float(), nullable=False),
+            sa.Column("sales_count", sa.Integer(), nullable=False),
+        )
+
+
+def downgrade() -> None:
+    op.drop_table("daily_sales_rollup")
+    op.drop_index("ix_financial_totals_id", table_name="financial_totals", if_exists=True)
+    op.drop_table("financial_totals")
@@ -1,17 +1,40 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Any, Callable, Optional, Tuple
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+from sqlalchemy import select
 from sqlalchemy.orm import Session
-from .database import get_db
+from .database import AsyncSessionLocal, get_db
 from .config import settings
+from .cache import TTLCache
 from . import models, schemas
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+pwd_context = CryptContext(
+    schemes=["bcrypt"],
+    deprecated="auto",
+    bcrypt__rounds=settings.BCRYPT_ROUNDS,
+    bcrypt__min_desired_rounds=settings.BCRYPT_ROUNDS,
+    bcrypt__max_desired_rounds=settings.BCRYPT_ROUNDS
+)
+# bcrypt is CPU bound, so hashing runs on its own small pool instead of the
+# request threadpool; a login burst then queues here without starving other
+# endpoints.
+password_executor = ThreadPoolExecutor(
+    max_workers=settings.PASSWORD_HASH_WORKERS, thread_name_prefix="password"
+)
 security = HTTPBearer()
 
+# Authenticated users are cached by id as detached UserOut principals, so
+# most requests resolve their user without touching the users table. The
+# cache is per process: update_user drops the entry in the worker that made
+# the change, and other workers see it once their entry is older than
+# AUTH_CACHE_TTL_SECONDS.
+_user_cache = TTLCache(ttl=settings.AUTH_CACHE_TTL_SECONDS, maxsize=settings.AUTH_CACHE_MAX_SIZE)
+
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
@@ -21,6 +44,15 @@ def get_password_hash(password: str) -> str:
     return pwd_context.hash(password)
 
 
+def verify_and_update_password(plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    return pwd_context.verify_and_update(plain_password, hashed_password)
+
+
+async def run_password_task(func: Callable[..., Any], *args: Any) -> Any:
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(password_executor, func, *args)
+
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     to_encode = data.copy()
     if expires_delta:
@@ -44,36 +76,100 @@ def decode_token(token: str) -> Optional[schemas.TokenData]:
         return None
 
 
-def get_current_user(
-    credentials: HTTPAuthorizationCredentials = Depends(security),
-    db: Session = Depends(get_db)
-) -> models.User:
-    token = credentials.credentials
-    credentials_exception = HTTPException(
+def invalidate_cached_user(user_id: int) -> None:
+    _user_cache.invalidate(user_id)
+
+
+def _principal_query(token_data: schemas.TokenData):
+    if token_data.user_id is None:
+        return select(models.User).where(models.User.email == token_data.email)
+    return select(models.User).where(models.User.id == token_data.user_id)
+
+
+def _cached_principal(token_data: schemas.TokenData) -> Optional[schemas.UserOut]:
+    return None if token_data.user_id is None else _user_cache.get(token_data.user_id)
+
+
+def _remember_principal(
+    token_data: schemas.TokenData, user: Optional[models.User], generation: int
+) -> Optional[schemas.UserOut]:
+    # generation is taken before the user is loaded, so a row read before an
+    # invalidate_cached_user() is returned but never written back
+    if user is None:
+        return None
+    principal = schemas.UserOut.model_validate(user)
+    if token_data.user_id is not None:
+        _user_cache.set_if_current(token_data.user_id, principal, generation)
+    return principal
+
+
+def _load_principal(db: Session, token_data: schemas.TokenData) -> Optional[schemas.UserOut]:
+    principal = _cached_principal(token_data)
+    if principal is None:
+        generation = _user_cache.generation()
+        principal = _remember_principal(token_data, db.scalars(_principal_query(token_data)).first(), generation)
+    return principal
+
+
+def _credentials_exception() -> HTTPException:
+    return HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
 
-    token_data = decode_token(token)
-    if token_data is None:
-        raise credentials_exception
 
-    user = db.query(models.User).filter(models.User.email == token_data.email).first()
-    if user is None:
-        raise credentials_exception
+def _check_principal(user: Optional[schemas.UserOut], token_data: schemas.TokenData) -> schemas.UserOut:
+    # Tokens are issued for an email, so changing it invalidates old tokens
+    if user is None or user.email != token_data.email:
+        raise _credentials_exception()
     if not user.is_active:
         raise HTTPException(status_code=400, detail="Inactive user")
     return user
 
 
-def get_current_active_user(current_user: models.User = Depends(get_current_user)) -> models.User:
+def get_current_user(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    db: Session = Depends(get_db)
+) -> schemas.UserOut:
+    token_data = decode_token(credentials.credentials)
+    if token_data is None:
+        raise _credentials_exception()
+    return _check_principal(_load_principal(db, token_data), token_data)
+
+
+async def get_current_user_async(
+    credentials: HTTPAuthorizationCredentials = Depends(security)
+) -> schemas.UserOut:
+    # For async routes: a cache hit never leaves the event loop, and a miss
+    # opens an async session only then
+    token_data = decode_token(credentials.credentials)
+    if token_data is None:
+        raise _credentials_exception()
+    principal = _cached_principal(token_data)
+    if principal is None:
+        generation = _user_cache.generation()
+        async with AsyncSessionLocal() as db:
+            user = (await db.scalars(_principal_query(token_data))).first()
+            principal = _remember_principal(token_data, user, generation)
+    return _check_principal(principal, token_data)
+
+
+def get_current_active_user(current_user: schemas.UserOut = Depends(get_current_user)) -> schemas.UserOut:
+    if not current_user.is_active:
+        raise HTTPException(status_code=400, detail="Inactive user")
+    return current_user
+
+
+async def get_current_active_user_async(
+    current_user: schemas.UserOut = Depends(get_current_user_async)
+) -> schemas.UserOut:
     if not current_user.is_active:
         raise HTTPException(status_code=400, detail="Inactive user")
     return current_user
 
 
-def require_admin(current_user: models.User = Depends(get_current_user)) -> models.User:
+def require_admin(current_user: schemas.UserOut = Depends(get_current_user)) -> schemas.UserOut:
     if current_user.role != models.UserRole.ADMIN:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
@@ -82,7 +178,7 @@ def require_admin(current_user: models.User = Depends(get_current_user)) -> mode
     return current_user
 
 
-def require_manager_or_admin(current_user: models.User = Depends(get_current_user)) -> models.User:
+def require_manager_or_admin(current_user: schemas.UserOut = Depends(get_current_user)) -> schemas.UserOut:
     if current_user.role not in [models.UserRole.ADMIN, models.UserRole.MANAGER]:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
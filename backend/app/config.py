@@ -11,10 +11,49 @@ class Settings(BaseSettings):
     # Database
     DATABASE_URL: str = "sqlite:///./siams.db"
 
+    # Optional read replica for analytics and exports
+    READ_DATABASE_URL: Optional[str] = None
+    READ_REPLICA_MAX_LAG_SECONDS: float = 30
+    READ_REPLICA_CHECK_INTERVAL_SECONDS: float = 5
+
+    # SQLite tuning, applied to every new connection (ignored for other databases)
+    SQLITE_PRAGMAS_ENABLED: bool = True
+    SQLITE_JOURNAL_MODE: str = "WAL"
+    SQLITE_SYNCHRONOUS: str = "NORMAL"
+    SQLITE_BUSY_TIMEOUT_MS: int = 5000
+    SQLITE_CACHE_SIZE_KB: int = 64 * 1024
+    SQLITE_MMAP_SIZE: int = 256 * 1024 * 1024
+
+    # Connection pool for server databases such as PostgreSQL
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 20
+    DB_POOL_TIMEOUT: int = 30
+    DB_POOL_RECYCLE: int = 1800
+
     # JWT Settings
     SECRET_KEY: str = secrets.token_urlsafe(32)
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 60 * 24 * 7  # 7 days
+    # Per-process; bounds how long other workers honour a deactivated or demoted user
+    AUTH_CACHE_TTL_SECONDS: float = 30
+    # Changing BCRYPT_ROUNDS rehashes each password on its owner's next login
+    BCRYPT_ROUNDS: int = 12
+    PASSWORD_HASH_WORKERS: int = 2
+    AUTH_CACHE_MAX_SIZE: int = 10000
+
+    # POS SKU lookups; bounds how stale a scan can be after another worker's write
+    SKU_INDEX_TTL_SECONDS: float = 60
+    SKU_INDEX_MAX_SIZE: int = 1000000
+
+    # Dashboard
+    DASHBOARD_CACHE_TTL_SECONDS: float = 10
+    DASHBOARD_WORKERS: int = 4
+
+    # Response compression; bodies smaller than the minimum are sent as-is.
+    # Brotli is used when brotli-asgi is installed, gzip otherwise.
+    COMPRESSION_MINIMUM_SIZE: int = 1000
+    GZIP_COMPRESS_LEVEL: int = 6
+    BROTLI_QUALITY: int = 4
 
     # CORS
     CORS_ORIGINS: list = ["http://localhost:5173", "http://localhost:3000", "http://127.0.0.1:5173"]
@@ -1,14 +1,147 @@
-from sqlalchemy.orm import Session
-from sqlalchemy import func, desc
-from datetime import datetime, timedelta
-from typing import List, Optional
-from . import models, schemas
-from .auth import get_password_hash, verify_password
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, joinedload, selectinload
+from sqlalchemy import func, desc, case, and_, or_, select, union_all, update, insert, bindparam
+from datetime import date, datetime, timedelta
+import base64
+import hashlib
+import json
+from typing import Iterable, List, Optional
+from concurrent.futures import ThreadPoolExecutor
+from . import models, schemas, search
+from fastapi.concurrency import run_in_threadpool
+from .auth import (
+    get_password_hash,
+    verify_and_update_password,
+    invalidate_cached_user,
+    run_password_task
+)
+from .cache import TTLCache
+from .config import settings
+from .database import SessionLocal
+from .imports import parse_date
+from .sku_index import ScanProduct, product_sku_index, scan_query, track_products
+
+
+# ==================== PAGINATION ====================
+# Listings are ordered by a fixed key ending in the primary key. An opaque
+# cursor carries the key values of the last row of a page, and the next page
+# is fetched with a keyset predicate instead of OFFSET, so page cost stays
+# constant and rows don't shift when new ones are inserted.
+SALE_CURSOR_KEYS = (("date", True), ("id", True))
+PURCHASE_CURSOR_KEYS = (("date", True), ("id", True))
+PAYMENT_CURSOR_KEYS = (("date", True), ("id", True))
+ORDER_CURSOR_KEYS = (("date", True), ("id", True))
+PRODUCT_CURSOR_KEYS = (("id", False),)
+
+# Sort options for filtered listings; each is a cursor key ending in the
+# primary key, and "-" means descending. The first entry is the default.
+SALE_SORTS = {
+    "-date": SALE_CURSOR_KEYS,
+    "date": (("date", False), ("id", False)),
+    "-total_amount": (("total_amount", True), ("id", True)),
+    "total_amount": (("total_amount", False), ("id", False)),
+}
+PURCHASE_SORTS = {
+    "-date": PURCHASE_CURSOR_KEYS,
+    "date": (("date", False), ("id", False)),
+    "-total_amount": (("total_amount", True), ("id", True)),
+    "total_amount": (("total_amount", False), ("id", False)),
+}
+
+
+def encode_cursor(values: list) -> str:
+    raw = json.dumps(values, default=lambda v: v.isoformat(), separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def _decode_cursor(model, keys: tuple, cursor: str) -> list:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        raw_values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        if not isinstance(raw_values, list) or len(raw_values) != len(keys):
+            raise ValueError
+        values = []
+        for (name, _), value in zip(keys, raw_values):
+            python_type = getattr(model, name).type.python_type
+            if value is None:
+                values.append(None)
+            elif python_type is date:
+                values.append(date.fromisoformat(value))
+            elif python_type is datetime:
+                values.append(datetime.fromisoformat(value))
+            else:
+                values.append(python_type(value))
+        return values
+    except (ValueError, TypeError):
+        raise ValueError("Invalid cursor")
+
+
+def _keyset_order(model, keys: tuple) -> list:
+    return [desc(getattr(model, name)) if descending else getattr(model, name) for name, descending in keys]
+
+
+def _apply_keyset(query, model, keys: tuple, cursor: str):
+    values = _decode_cursor(model, keys, cursor)
+    clauses = []
+    for i, (name, descending) in enumerate(keys):
+        column = getattr(model, name)
+        ties = [getattr(model, prev) == values[j] for j, (prev, _) in enumerate(keys[:i])]
+        after = column < values[i] if descending else column > values[i]
+        clauses.append(and_(*ties, after))
+    # The redundant bound on the leading key lets the database seek the index
+    # instead of scanning from the first row and filtering.
+    lead_name, lead_descending = keys[0]
+    lead_column = getattr(model, lead_name)
+    lead_bound = lead_column <= values[0] if lead_descending else lead_column >= values[0]
+    return query.where(lead_bound, or_(*clauses))
+
+
+def _paginate(query, model, keys: tuple, skip: int, limit: int, cursor: Optional[str]):
+    query = query.order_by(*_keyset_order(model, keys))
+    if cursor:
+        query = _apply_keyset(query, model, keys, cursor)
+    else:
+        query = query.offset(skip)
+    return query.limit(limit)
+
+
+def sort_keys(sorts: dict, sort: Optional[str]) -> tuple:
+    if not sort:
+        return next(iter(sorts.values()))
+    if sort not in sorts:
+        raise ValueError(f"Invalid sort '{sort}', expected one of: {', '.join(sorts)}")
+    return sorts[sort]
+
+
+def _filter_conditions(model, filters) -> list:
+    # Filter fields name model columns, except the inclusive date bounds
+    if filters is None:
+        return []
+    conditions = []
+    for name, value in filters.model_dump(exclude_none=True).items():
+        if name == "date_from":
+            conditions.append(model.date >= value)
+        elif name == "date_to":
+            conditions.append(model.date <= value)
+        else:
+            conditions.append(getattr(model, name) == value)
+    return conditions
+
+
+def _count_query(model, filters):
+    return select(func.count()).select_from(model).where(*_filter_conditions(model, filters))
+
+
+def next_page_cursor(rows: list, limit: int, keys: tuple) -> Optional[str]:
+    if not rows or len(rows) < limit:
+        return None
+    return encode_cursor([getattr(rows[-1], name) for name, _ in keys])
 
 
 # ==================== USER OPERATIONS ====================
-def create_user(db: Session, user: schemas.UserCreate) -> models.User:
-    hashed_password = get_password_hash(user.password)
+def create_user(db: Session, user: schemas.UserCreate, hashed_password: Optional[str] = None) -> models.User:
+    if hashed_password is None:
+        hashed_password = get_password_hash(user.password)
     db_user = models.User(
         email=user.email,
         hashed_password=hashed_password,
@@ -41,15 +174,45 @@ def update_user(db: Session, user_id: int, user_update: schemas.UserUpdate) -> O
             setattr(db_user, key, value)
         db.commit()
         db.refresh(db_user)
+        invalidate_cached_user(user_id)
     return db_user
 
 
+def _rehash_password(db: Session, user: models.User, hashed_password: str) -> None:
+    user.hashed_password = hashed_password
+    db.commit()
+    db.refresh(user)
+
+
 def authenticate_user(db: Session, email: str, password: str) -> Optional[models.User]:
     user = get_user_by_email(db, email)
     if not user:
         return None
-    if not verify_password(password, user.hashed_password):
+    valid, new_hash = verify_and_update_password(password, user.hashed_password)
+    if not valid:
         return None
+    if new_hash:
+        _rehash_password(db, user, new_hash)
+    return user
+
+
+# Async variants used by the auth routes: database work runs on the request
+# threadpool and bcrypt on the dedicated password executor, so neither holds
+# a request thread while hashing.
+async def create_user_async(db: Session, user: schemas.UserCreate) -> models.User:
+    hashed_password = await run_password_task(get_password_hash, user.password)
+    return await run_in_threadpool(create_user, db, user, hashed_password)
+
+
+async def authenticate_user_async(db: Session, email: str, password: str) -> Optional[models.User]:
+    user = await run_in_threadpool(get_user_by_email, db, email)
+    if not user:
+        return None
+    valid, new_hash = await run_password_task(verify_and_update_password, password, user.hashed_password)
+    if not valid:
+        return None
+    if new_hash:
+        await run_in_threadpool(_rehash_password, db, user, new_hash)
     return user
 
 
@@ -79,11 +242,49 @@ def create_product(db: Session, product: schemas.ProductCreate) -> models.Produc
     return db_product
 
 
-def get_products(db: Session, skip: int = 0, limit: int = 100, active_only: bool = True) -> List[models.Product]:
-    query = db.query(models.Product)
+# Hot read paths build a select() once and run it from both the sync and the
+# async session, so the two variants cannot drift apart.
+def _products_query(skip: int, limit: int, active_only: bool, cursor: Optional[str]):
+    query = select(models.Product).options(joinedload(models.Product.category))
     if active_only:
-        query = query.filter(models.Product.is_active == True)
-    return query.offset(skip).limit(limit).all()
+        query = query.where(models.Product.is_active == True)
+    return _paginate(query, models.Product, PRODUCT_CURSOR_KEYS, skip, limit, cursor)
+
+
+def get_products(
+    db: Session,
+    skip: int = 0,
+    limit: int = 100,
+    active_only: bool = True,
+    cursor: Optional[str] = None
+) -> List[models.Product]:
+    return db.scalars(_products_query(skip, limit, active_only, cursor)).all()
+
+
+async def get_products_async(
+    db: AsyncSession,
+    skip: int = 0,
+    limit: int = 100,
+    active_only: bool = True,
+    cursor: Optional[str] = None
+) -> List[models.Product]:
+    return (await db.scalars(_products_query(skip, limit, active_only, cursor))).all()
+
+
+def search_products(db: Session, query: str, limit: int = 20) -> List[models.Product]:
+    if not query.strip():
+        raise ValueError("Search query must not be empty")
+    ids = search.search_product_ids(db, query, limit)
+    if not ids:
+        return []
+    products = {
+        product.id: product
+        for product in db.scalars(
+            select(models.Product).options(joinedload(models.Product.category)).where(models.Product.id.in_(ids))
+        )
+    }
+    # Keep the search ranking
+    return [products[product_id] for product_id in ids if product_id in products]
 
 
 def get_product(db: Session, product_id: int) -> Optional[models.Product]:
@@ -96,18 +297,141 @@ def update_product(db: Session, product_id: int, product_update: schemas.Product
         update_data = product_update.model_dump(exclude_unset=True)
         for key, value in update_data.items():
             setattr(db_product, key, value)
+        track_products(db, [product_id])
         db.commit()
         db.refresh(db_product)
     return db_product
 
 
+async def get_product_for_scan_async(db: AsyncSession, sku: str) -> Optional[ScanProduct]:
+    product = product_sku_index.get(sku)
+    if product is None:
+        row = (await db.execute(scan_query(sku))).first()
+        product = product_sku_index.store(row) if row else None
+    return product
+
+
 def get_low_stock_products(db: Session) -> List[models.Product]:
-    return db.query(models.Product).filter(
+    return db.query(models.Product).options(joinedload(models.Product.category)).filter(
         models.Product.stock_qty <= models.Product.min_stock_level,
         models.Product.is_active == True
     ).all()
 
 
+# Catalog syncs upsert by SKU in chunks. Incoming rows are compared with the
+# stored ones by a digest of the fields they set, unchanged rows are skipped,
+# and the rest go through one INSERT ... ON CONFLICT(sku) DO UPDATE per chunk.
+# Fields a row leaves unset (e.g. stock_qty) keep their stored values.
+PRODUCT_UPSERT_CHUNK_SIZE = 1000
+PRODUCT_UPSERT_FIELDS = (
+    "name", "description", "category_id", "stock_qty", "min_stock_level", "cost_price", "sell_price"
+)
+
+
+def _product_digest(values, fields) -> str:
+    return hashlib.sha1(repr(tuple(values[f] for f in fields)).encode()).hexdigest()
+
+
+def _write_product_rows(db: Session, columns: tuple, rows: List[dict], insert_new: bool) -> None:
+    table = models.Product.__table__
+    insert_stmt = _dialect_insert(db)
+    if insert_stmt is not None:
+        stmt = insert_stmt(table)
+        set_ = {c: stmt.excluded[c] for c in columns if c != "sku"}
+        set_["updated_at"] = datetime.utcnow()
+        db.execute(stmt.on_conflict_do_update(index_elements=["sku"], set_=set_), rows)
+    elif insert_new:
+        db.execute(insert(table), rows)
+    else:
+        db.execute(
+            update(table).where(table.c.sku == bindparam("b_sku")).values(
+                {c: bindparam(c) for c in columns if c != "sku"}, updated_at=datetime.utcnow()
+            ),
+            [{**row, "b_sku": row["sku"]} for row in rows]
+        )
+
+
+def upsert_products(db: Session, products: List[schemas.ProductCreate]) -> dict:
+    table = models.Product.__table__
+    incoming = {}
+    for product in products:
+        incoming[product.sku] = product  # last row for a SKU wins
+
+    result = {"created": 0, "updated": 0, "unchanged": 0}
+    items = list(incoming.items())
+    for start in range(0, len(items), PRODUCT_UPSERT_CHUNK_SIZE):
+        chunk = items[start:start + PRODUCT_UPSERT_CHUNK_SIZE]
+        existing = {
+            row.sku: row._mapping
+            for row in db.execute(
+                select(table.c.sku, *[table.c[f] for f in PRODUCT_UPSERT_FIELDS]).where(
+                    table.c.sku.in_([sku for sku, _ in chunk])
+                )
+            )
+        }
+
+        # Rows are grouped by the columns they carry so each group is one executemany
+        pending = {}
+        for sku, product in chunk:
+            stored = existing.get(sku)
+            if stored is None:
+                values = product.model_dump()
+                result["created"] += 1
+            else:
+                values = product.model_dump(exclude_unset=True)
+                fields = [f for f in PRODUCT_UPSERT_FIELDS if f in values]
+                if _product_digest(values, fields) == _product_digest(stored, fields):
+                    result["unchanged"] += 1
+                    continue
+                result["updated"] += 1
+            pending.setdefault((stored is None, tuple(sorted(values))), []).append(values)
+
+        for (insert_new, columns), rows in pending.items():
+            _write_product_rows(db, columns, rows, insert_new)
+            if not insert_new:
+                track_products(db, skus=[row["sku"] for row in rows])
+        db.commit()
+
+    if result["created"] or result["updated"]:
+        invalidate_dashboard_cache()
+    return result
+
+
+# Stock changes are applied as single conditional UPDATEs rather than
+# read-check-write in Python, so concurrent tills can never oversell and the
+# check does not rely on the database serializing writers.
+_products_table = models.Product.__table__
+
+
+def _stock_params(quantities: dict) -> List[dict]:
+    # Rows are updated, and so locked, in ascending id order, so concurrent
+    # writers touching the same products cannot deadlock on each other
+    return [{"product_id": pid, "qty": qty} for pid, qty in sorted(quantities.items())]
+
+
+def _decrement_stock(db: Session, quantities: dict) -> bool:
+    # True only if every product had enough stock and was decremented
+    stmt = update(_products_table).where(
+        _products_table.c.id == bindparam("product_id"),
+        _products_table.c.stock_qty >= bindparam("qty")
+    ).values(stock_qty=_products_table.c.stock_qty - bindparam("qty"))
+    result = db.execute(stmt, _stock_params(quantities))
+    track_products(db, quantities)
+    return result.rowcount == len(quantities)
+
+
+def _increment_stock(db: Session, quantities: dict) -> None:
+    stmt = update(_products_table).where(
+        _products_table.c.id == bindparam("product_id")
+    ).values(stock_qty=_products_table.c.stock_qty + bindparam("qty"))
+    db.execute(stmt, _stock_params(quantities))
+    track_products(db, quantities)
+
+
+def _available_stock(db: Session, product_id: int) -> int:
+    return db.query(models.Product.stock_qty).filter(models.Product.id == product_id).scalar()
+
+
 # ==================== SUPPLIER OPERATIONS ====================
 def create_supplier(db: Session, supplier: schemas.SupplierCreate) -> models.Supplier:
     db_supplier = models.Supplier(**supplier.model_dump())
@@ -170,7 +494,7 @@ def record_purchase(db: Session, purchase: schemas.PurchaseCreate, user_id: int
     if not product:
         raise ValueError("Product not found")
 
-    product.stock_qty += purchase.qty
+    _increment_stock(db, {product.id: purchase.qty})
     total_amount = purchase.qty * purchase.purchase_price
 
     db_purchase = models.Purchase(
@@ -184,33 +508,166 @@ def record_purchase(db: Session, purchase: schemas.PurchaseCreate, user_id: int
         date=purchase.date
     )
     db.add(db_purchase)
+    _bump_financial_totals(db, expenses=total_amount)
     db.commit()
+    invalidate_dashboard_cache()
     db.refresh(db_purchase)
     return db_purchase
 
 
-def get_purchases(db: Session, skip: int = 0, limit: int = 100) -> List[models.Purchase]:
-    return db.query(models.Purchase).order_by(desc(models.Purchase.date)).offset(skip).limit(limit).all()
+MAX_IMPORT_ERRORS = 100
+
+
+def _parse_import_row(row: dict, default_date: date) -> dict:
+    sku = str(row.get("sku") or "").strip()
+    if not sku:
+        raise ValueError("Missing SKU")
+    try:
+        raw_qty = float(row.get("qty"))
+        purchase_price = float(row.get("purchase_price"))
+    except (TypeError, ValueError):
+        raise ValueError("qty and purchase_price must be numbers")
+    # XLSX cells come back as floats; a fractional qty is an error, not 2.7 -> 2
+    if not raw_qty.is_integer():
+        raise ValueError("qty must be a whole number")
+    qty = int(raw_qty)
+    if qty <= 0:
+        raise ValueError("qty must be positive")
+    purchase_date = parse_date(row["date"]) if row.get("date") else default_date
+    notes = row.get("notes") or None
+    return {"sku": sku, "qty": qty, "purchase_price": purchase_price, "date": purchase_date, "notes": notes}
+
+
+def import_purchases(
+    db: Session,
+    chunks: Iterable[List[dict]],
+    supplier_id: int,
+    default_date: date,
+    user_id: int = None
+) -> dict:
+    # Each chunk resolves its SKUs with one query, inserts its purchases with
+    # one executemany, applies one aggregated stock increment per product and
+    # commits, so a large manifest imports in a handful of round trips.
+    if not get_supplier(db, supplier_id):
+        raise ValueError("Supplier not found")
+
+    report = {
+        "rows_processed": 0,
+        "imported": 0,
+        "failed": 0,
+        "total_qty": 0,
+        "total_amount": 0,
+        "chunks": [],
+        "errors": []
+    }
+
+    def fail(row_number: int, error: str) -> None:
+        report["failed"] += 1
+        if len(report["errors"]) < MAX_IMPORT_ERRORS:
+            report["errors"].append({"row": row_number, "error": error})
+
+    row_number = 1  # header row
+    for chunk_number, chunk in enumerate(chunks, start=1):
+        failed_before = report["failed"]
+        parsed = []
+        for row in chunk:
+            row_number += 1
+            try:
+                parsed.append((row_number, _parse_import_row(row, default_date)))
+            except ValueError as e:
+                fail(row_number, str(e))
+
+        product_ids = dict(db.query(models.Product.sku, models.Product.id).filter(
+            models.Product.sku.in_({item["sku"] for _, item in parsed})
+        ).all())
+
+        purchases = []
+        stock = {}
+        for number, item in parsed:
+            product_id = product_ids.get(item["sku"])
+            if product_id is None:
+                fail(number, f"Unknown SKU: {item['sku']}")
+                continue
+            purchases.append({
+                "supplier_id": supplier_id,
+                "product_id": product_id,
+                "user_id": user_id,
+                "qty": item["qty"],
+                "purchase_price": item["purchase_price"],
+                "total_amount": item["qty"] * item["purchase_price"],
+                "notes": item["notes"],
+                "date": item["date"]
+            })
+            stock[product_id] = stock.get(product_id, 0) + item["qty"]
+
+        if purchases:
+            chunk_amount = sum(p["total_amount"] for p in purchases)
+            db.execute(insert(models.Purchase), purchases)
+            _increment_stock(db, stock)
+            _bump_financial_totals(db, expenses=chunk_amount)
+            db.commit()
+            report["imported"] += len(purchases)
+            report["total_qty"] += sum(stock.values())
+            report["total_amount"] += chunk_amount
+
+        report["rows_processed"] += len(chunk)
+        report["chunks"].append({
+            "chunk": chunk_number,
+            "rows": len(chunk),
+            "imported": len(purchases),
+            "failed": report["failed"] - failed_before
+        })
+
+    if report["imported"]:
+        invalidate_dashboard_cache()
+    return report
+
+
+def _reference_loader(relationship, expanded: bool):
+    # List rows only serialize a related record's id and name unless the
+    # relation is expanded, so only those columns are loaded
+    target = relationship.property.mapper.class_
+    loader = joinedload(relationship)
+    if not expanded:
+        return loader.load_only(target.id, target.name)
+    if target is models.Product:
+        return loader.joinedload(models.Product.category)
+    return loader
+
+
+def _purchase_loader_options(expand: Iterable[str] = tuple(schemas.PURCHASE_EXPANSIONS)):
+    return (
+        _reference_loader(models.Purchase.supplier, "supplier" in expand),
+        _reference_loader(models.Purchase.product, "product" in expand)
+    )
+
+
+def get_purchases(
+    db: Session, skip: int = 0, limit: int = 100, cursor: Optional[str] = None,
+    sort: Optional[str] = None, filters: Optional[schemas.PurchaseFilters] = None,
+    expand: Iterable[str] = tuple(schemas.PURCHASE_EXPANSIONS)
+) -> List[models.Purchase]:
+    keys = sort_keys(PURCHASE_SORTS, sort)
+    query = db.query(models.Purchase).options(*_purchase_loader_options(expand)).filter(
+        *_filter_conditions(models.Purchase, filters)
+    )
+    return _paginate(query, models.Purchase, keys, skip, limit, cursor).all()
+
+
+def count_purchases(db: Session, filters: Optional[schemas.PurchaseFilters] = None) -> int:
+    return db.scalar(_count_query(models.Purchase, filters))
 
 
 def get_purchase(db: Session, purchase_id: int) -> Optional[models.Purchase]:
-    return db.query(models.Purchase).filter(models.Purchase.id == purchase_id).first()
+    return db.query(models.Purchase).options(*_purchase_loader_options()).filter(
+        models.Purchase.id == purchase_id
+    ).first()
 
 
 # ==================== SALE OPERATIONS ====================
-def record_sale(db: Session, sale: schemas.SaleCreate, user_id: int = None) -> models.Sale:
-    product = get_product(db, sale.product_id)
-    if not product:
-        raise ValueError("Product not found")
-    if product.stock_qty < sale.qty:
-        raise ValueError(f"Insufficient stock. Available: {product.stock_qty}")
-
-    product.stock_qty -= sale.qty
+def _build_sale(sale: schemas.SaleCreate, product: models.Product, user_id: Optional[int]) -> models.Sale:
     total_amount = sale.qty * sale.selling_price
-    profit = (sale.selling_price - product.cost_price) * sale.qty
-    is_fully_paid = sale.paid_amount >= total_amount
-
-    db_sale = models.Sale(
+    return models.Sale(
         customer_id=sale.customer_id,
         product_id=sale.product_id,
         user_id=user_id,
@@ -218,19 +675,130 @@ def record_sale(db: Session, sale: schemas.SaleCreate, user_id: int = None) -> m
         selling_price=sale.selling_price,
         total_amount=total_amount,
         paid_amount=sale.paid_amount,
-        is_fully_paid=is_fully_paid,
-        profit=profit,
+        is_fully_paid=sale.paid_amount >= total_amount,
+        profit=(sale.selling_price - product.cost_price) * sale.qty,
         notes=sale.notes,
         date=sale.date
     )
+
+
+def _apply_sale_totals(db: Session, sales: List[models.Sale]) -> None:
+    _bump_financial_totals(
+        db,
+        revenue=sum(s.total_amount for s in sales),
+        profit=sum(s.profit for s in sales),
+        receivables=sum(_outstanding_balance(s.total_amount, s.paid_amount, s.is_fully_paid) for s in sales)
+    )
+    daily = {}
+    for s in sales:
+        revenue, profit, count = daily.get(s.date, (0, 0, 0))
+        daily[s.date] = (revenue + s.total_amount, profit + s.profit, count + 1)
+    for sale_date, (revenue, profit, count) in daily.items():
+        _bump_daily_sales(db, sale_date, revenue=revenue, profit=profit, count=count)
+
+
+def record_sale(db: Session, sale: schemas.SaleCreate, user_id: int = None) -> models.Sale:
+    product = get_product(db, sale.product_id)
+    if not product:
+        raise ValueError("Product not found")
+    if not _decrement_stock(db, {product.id: sale.qty}):
+        db.rollback()
+        raise ValueError(f"Insufficient stock. Available: {_available_stock(db, product.id)}")
+
+    db_sale = _build_sale(sale, product, user_id)
     db.add(db_sale)
+    _apply_sale_totals(db, [db_sale])
     db.commit()
+    invalidate_dashboard_cache()
     db.refresh(db_sale)
     return db_sale
 
 
-def get_sales(db: Session, skip: int = 0, limit: int = 100) -> List[models.Sale]:
-    return db.query(models.Sale).order_by(desc(models.Sale.date)).offset(skip).limit(limit).all()
+def record_sales_bulk(db: Session, sales: List[schemas.SaleCreate], user_id: int = None) -> dict:
+    # Load and lock every affected product once, apply each item's
+    # conditional stock decrement in order, then write all accepted sales in
+    # a single transaction. Locking in id order up front keeps the batch-order
+    # decrements from deadlocking with other writers (a no-op on SQLite).
+    product_ids = {sale.product_id for sale in sales}
+    products = {
+        p.id: p for p in db.query(models.Product).filter(
+            models.Product.id.in_(product_ids)
+        ).order_by(models.Product.id).with_for_update()
+    }
+
+    results = []
+    accepted = []
+    for index, sale in enumerate(sales):
+        product = products.get(sale.product_id)
+        if not product:
+            results.append({"index": index, "success": False, "error": "Product not found"})
+            continue
+        if not _decrement_stock(db, {product.id: sale.qty}):
+            results.append({
+                "index": index,
+                "success": False,
+                "error": f"Insufficient stock. Available: {_available_stock(db, product.id)}"
+            })
+            continue
+        db_sale = _build_sale(sale, product, user_id)
+        accepted.append(db_sale)
+        results.append({"index": index, "success": True, "sale": db_sale})
+
+    if accepted:
+        db.add_all(accepted)
+        _apply_sale_totals(db, accepted)
+        db.flush()
+        for result in results:
+            if result["success"]:
+                result["id"] = result.pop("sale").id
+        db.commit()
+        invalidate_dashboard_cache()
+
+    return {
+        "created": len(accepted),
+        "failed": len(results) - len(accepted),
+        "results": results
+    }
+
+
+def _sale_loader_options(expand: Iterable[str] = tuple(schemas.SALE_EXPANSIONS)):
+    return (
+        _reference_loader(models.Sale.customer, "customer" in expand),
+        _reference_loader(models.Sale.product, "product" in expand)
+    )
+
+
+def _sales_query(skip: int, limit: int, cursor: Optional[str], sort: Optional[str],
+                 filters: Optional[schemas.SaleFilters], expand: Iterable[str]):
+    keys = sort_keys(SALE_SORTS, sort)
+    query = select(models.Sale).options(*_sale_loader_options(expand)).where(
+        *_filter_conditions(models.Sale, filters)
+    )
+    return _paginate(query, models.Sale, keys, skip, limit, cursor)
+
+
+def get_sales(
+    db: Session, skip: int = 0, limit: int = 100, cursor: Optional[str] = None,
+    sort: Optional[str] = None, filters: Optional[schemas.SaleFilters] = None,
+    expand: Iterable[str] = tuple(schemas.SALE_EXPANSIONS)
+) -> List[models.Sale]:
+    return db.scalars(_sales_query(skip, limit, cursor, sort, filters, expand)).all()
+
+
+async def get_sales_async(
+    db: AsyncSession, skip: int = 0, limit: int = 100, cursor: Optional[str] = None,
+    sort: Optional[str] = None, filters: Optional[schemas.SaleFilters] = None,
+    expand: Iterable[str] = tuple(schemas.SALE_EXPANSIONS)
+) -> List[models.Sale]:
+    return (await db.scalars(_sales_query(skip, limit, cursor, sort, filters, expand))).all()
+
+
+def count_sales(db: Session, filters: Optional[schemas.SaleFilters] = None) -> int:
+    return db.scalar(_count_query(models.Sale, filters))
+
+
+async def count_sales_async(db: AsyncSession, filters: Optional[schemas.SaleFilters] = None) -> int:
+    return await db.scalar(_count_query(models.Sale, filters))
 
 
 def get_sale(db: Session, sale_id: int) -> Optional[models.Sale]:
@@ -240,145 +808,591 @@ def get_sale(db: Session, sale_id: int) -> Optional[models.Sale]:
 def update_sale_payment(db: Session, sale_id: int, additional_payment: float) -> Optional[models.Sale]:
     sale = get_sale(db, sale_id)
     if sale:
-        sale.paid_amount += additional_payment
-        sale.is_fully_paid = sale.paid_amount >= sale.total_amount
+        _apply_payment(db, sale, additional_payment)
         db.commit()
+        invalidate_dashboard_cache()
         db.refresh(sale)
     return sale
 
 
+def _apply_payment(db: Session, target, amount: float) -> None:
+    # target is a Sale or an Order; both carry total/paid amounts
+    outstanding_before = _outstanding_balance(target.total_amount, target.paid_amount, target.is_fully_paid)
+    target.paid_amount += amount
+    target.is_fully_paid = target.paid_amount >= target.total_amount
+    outstanding_after = _outstanding_balance(target.total_amount, target.paid_amount, target.is_fully_paid)
+    _bump_financial_totals(db, receivables=outstanding_after - outstanding_before)
+
+
+# ==================== ORDER OPERATIONS ====================
+def record_order(db: Session, order: schemas.OrderCreate, user_id: int = None) -> models.Order:
+    # One order, many lines: all stock decrements go out as one conditional
+    # UPDATE batch and are committed together with the order.
+    requested = {}
+    for line in order.lines:
+        requested[line.product_id] = requested.get(line.product_id, 0) + line.qty
+
+    products = {
+        p.id: p for p in db.query(models.Product).filter(models.Product.id.in_(requested.keys()))
+    }
+    for product_id in requested:
+        if product_id not in products:
+            raise ValueError(f"Product {product_id} not found")
+    if not _decrement_stock(db, requested):
+        db.rollback()
+        for product_id, qty in requested.items():
+            available = _available_stock(db, product_id)
+            if available < qty:
+                raise ValueError(f"Insufficient stock for {products[product_id].name}. Available: {available}")
+        raise ValueError("Insufficient stock")
+
+    lines = []
+    for line in order.lines:
+        product = products[line.product_id]
+        lines.append(models.OrderLine(
+            product_id=line.product_id,
+            qty=line.qty,
+            selling_price=line.selling_price,
+            total_amount=line.qty * line.selling_price,
+            profit=(line.selling_price - product.cost_price) * line.qty
+        ))
+    total_amount = sum(line.total_amount for line in lines)
+    profit = sum(line.profit for line in lines)
+    is_fully_paid = order.paid_amount >= total_amount
+
+    db_order = models.Order(
+        customer_id=order.customer_id,
+        user_id=user_id,
+        total_amount=total_amount,
+        paid_amount=order.paid_amount,
+        is_fully_paid=is_fully_paid,
+        profit=profit,
+        notes=order.notes,
+        date=order.date,
+        lines=lines
+    )
+    db.add(db_order)
+    _bump_financial_totals(
+        db,
+        revenue=total_amount,
+        profit=profit,
+        receivables=_outstanding_balance(total_amount, order.paid_amount, is_fully_paid)
+    )
+    _bump_daily_sales(db, order.date, revenue=total_amount, profit=profit)
+    db.commit()
+    invalidate_dashboard_cache()
+    return get_order(db, db_order.id)
+
+
+def _order_loader_options():
+    return (
+        joinedload(models.Order.customer),
+        selectinload(models.Order.lines).joinedload(models.OrderLine.product).joinedload(models.Product.category)
+    )
+
+
+def get_orders(
+    db: Session, skip: int = 0, limit: int = 100, cursor: Optional[str] = None
+) -> List[models.Order]:
+    query = db.query(models.Order).options(*_order_loader_options())
+    return _paginate(query, models.Order, ORDER_CURSOR_KEYS, skip, limit, cursor).all()
+
+
+def get_order(db: Session, order_id: int) -> Optional[models.Order]:
+    return db.query(models.Order).options(*_order_loader_options()).filter(models.Order.id == order_id).first()
+
+
 # ==================== PAYMENT OPERATIONS ====================
 def record_payment(db: Session, payment: schemas.PaymentCreate) -> models.Payment:
-    sale = get_sale(db, payment.sale_id)
-    if not sale:
-        raise ValueError("Sale not found")
+    if payment.order_id is not None:
+        target = db.query(models.Order).filter(models.Order.id == payment.order_id).first()
+        if not target:
+            raise ValueError("Order not found")
+    else:
+        target = get_sale(db, payment.sale_id)
+        if not target:
+            raise ValueError("Sale not found")
 
-    sale.paid_amount += payment.amount
-    sale.is_fully_paid = sale.paid_amount >= sale.total_amount
+    _apply_payment(db, target, payment.amount)
 
     db_payment = models.Payment(**payment.model_dump())
     db.add(db_payment)
     db.commit()
+    invalidate_dashboard_cache()
     db.refresh(db_payment)
     return db_payment
 
 
-def get_payments(db: Session, skip: int = 0, limit: int = 100) -> List[models.Payment]:
-    return db.query(models.Payment).order_by(desc(models.Payment.date)).offset(skip).limit(limit).all()
+def get_payments(
+    db: Session, skip: int = 0, limit: int = 100, cursor: Optional[str] = None
+) -> List[models.Payment]:
+    query = db.query(models.Payment)
+    return _paginate(query, models.Payment, PAYMENT_CURSOR_KEYS, skip, limit, cursor).all()
 
 
 def get_customer_payments(db: Session, customer_id: int) -> List[models.Payment]:
     return db.query(models.Payment).filter(models.Payment.customer_id == customer_id).order_by(desc(models.Payment.date)).all()
 
 
+# ==================== FINANCIAL LEDGER ====================
+# financial_totals holds a single running-totals row that record_sale,
+# record_order, record_purchase and record_payment update in the same
+# transaction as the rows they write, so the dashboard never has to scan
+# sales/purchases.
+FINANCIAL_TOTALS_ID = 1
+FINANCIAL_TOTALS_FIELDS = ("total_revenue", "total_expenses", "net_profit", "outstanding_receivables")
+FINANCIAL_TOTALS_TOLERANCE = 0.005
+
+
+def _outstanding_balance(total_amount: float, paid_amount: float, is_fully_paid: bool) -> float:
+    return 0 if is_fully_paid else total_amount - (paid_amount or 0)
+
+
+def _bump_financial_totals(
+    db: Session,
+    revenue: float = 0,
+    expenses: float = 0,
+    profit: float = 0,
+    receivables: float = 0
+) -> None:
+    totals = models.FinancialTotals
+    db.query(totals).filter(totals.id == FINANCIAL_TOTALS_ID).update({
+        totals.total_revenue: totals.total_revenue + revenue,
+        totals.total_expenses: totals.total_expenses + expenses,
+        totals.net_profit: totals.net_profit + profit,
+        totals.outstanding_receivables: totals.outstanding_receivables + receivables,
+        totals.updated_at: datetime.utcnow()
+    }, synchronize_session=False)
+
+
+def compute_financial_totals(db: Session) -> dict:
+    totals = {key: 0 for key in FINANCIAL_TOTALS_FIELDS}
+    # Sales and multi-line orders are both receivables
+    for model in (models.Sale, models.Order):
+        revenue, profit, outstanding = db.query(
+            func.coalesce(func.sum(model.total_amount), 0),
+            func.coalesce(func.sum(model.profit), 0),
+            func.coalesce(func.sum(case(
+                (model.is_fully_paid == True, 0),
+                else_=model.total_amount - model.paid_amount
+            )), 0)
+        ).one()
+        totals["total_revenue"] += revenue
+        totals["net_profit"] += profit
+        totals["outstanding_receivables"] += outstanding
+    totals["total_expenses"] = db.query(func.coalesce(func.sum(models.Purchase.total_amount), 0)).scalar()
+    return totals
+
+
+def _financial_totals_query():
+    return select(models.FinancialTotals).where(models.FinancialTotals.id == FINANCIAL_TOTALS_ID)
+
+
+def get_financial_totals(db: Session) -> Optional[models.FinancialTotals]:
+    return db.scalars(_financial_totals_query()).first()
+
+
+def rebuild_financial_totals(db: Session) -> models.FinancialTotals:
+    actual = compute_financial_totals(db)
+    db_totals = get_financial_totals(db)
+    if not db_totals:
+        db_totals = models.FinancialTotals(id=FINANCIAL_TOTALS_ID)
+        db.add(db_totals)
+    for key, value in actual.items():
+        setattr(db_totals, key, value)
+    db_totals.updated_at = datetime.utcnow()
+    db.commit()
+    db.refresh(db_totals)
+    return db_totals
+
+
+def ensure_financial_totals(db: Session) -> models.FinancialTotals:
+    return get_financial_totals(db) or rebuild_financial_totals(db)
+
+
+def verify_financial_totals(db: Session) -> dict:
+    # Empty result means the ledger matches the raw tables
+    actual = compute_financial_totals(db)
+    db_totals = get_financial_totals(db)
+    drift = {}
+    for key in FINANCIAL_TOTALS_FIELDS:
+        ledger_value = getattr(db_totals, key) if db_totals else None
+        if ledger_value is None or abs(ledger_value - actual[key]) > FINANCIAL_TOTALS_TOLERANCE:
+            drift[key] = {
+                "ledger": ledger_value,
+                "actual": actual[key],
+                "drift": None if ledger_value is None else ledger_value - actual[key]
+            }
+    return drift
+
+
+# ==================== DAILY SALES ROLLUP ====================
+# daily_sales_rollup keeps one row of revenue, profit and sale count per
+# sale date, updated alongside every sale write, so trend queries cost
+# O(days) rather than O(sales).
+TREND_GRANULARITIES = ("day", "week", "month")
+
+
+def _dialect_insert(db: Session):
+    dialect = db.get_bind().dialect.name
+    if dialect == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    elif dialect == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert
+    else:
+        return None
+    return insert
+
+
+def _bump_daily_sales(db: Session, sale_date: date, revenue: float, profit: float, count: int = 1) -> None:
+    rollup = models.DailySalesRollup
+    insert = _dialect_insert(db)
+    if insert is not None:
+        stmt = insert(rollup).values(date=sale_date, revenue=revenue, profit=profit, sales_count=count)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[rollup.date],
+            set_={
+                "revenue": rollup.revenue + stmt.excluded.revenue,
+                "profit": rollup.profit + stmt.excluded.profit,
+                "sales_count": rollup.sales_count + stmt.excluded.sales_count
+            }
+        )
+        db.execute(stmt)
+        return
+
+    updated = db.query(rollup).filter(rollup.date == sale_date).update({
+        rollup.revenue: rollup.revenue + revenue,
+        rollup.profit: rollup.profit + profit,
+        rollup.sales_count: rollup.sales_count + count
+    }, synchronize_session=False)
+    if not updated:
+        db.add(rollup(date=sale_date, revenue=revenue, profit=profit, sales_count=count))
+        db.flush()
+
+
+def _trend_bucket(day: date, granularity: str) -> date:
+    if granularity == "week":
+        return day - timedelta(days=day.weekday())
+    if granularity == "month":
+        return day.replace(day=1)
+    return day
+
+
+def rebuild_daily_sales_rollup(db: Session) -> int:
+    daily = {}
+    for model in (models.Sale, models.Order):
+        rows = db.query(
+            model.date, func.sum(model.total_amount), func.sum(model.profit), func.count(model.id)
+        ).group_by(model.date)
+        for sale_date, revenue, profit, count in rows:
+            day_revenue, day_profit, day_count = daily.get(sale_date, (0, 0, 0))
+            daily[sale_date] = (day_revenue + revenue, day_profit + profit, day_count + count)
+
+    db.query(models.DailySalesRollup).delete(synchronize_session=False)
+    db.add_all([
+        models.DailySalesRollup(date=sale_date, revenue=revenue, profit=profit, sales_count=count)
+        for sale_date, (revenue, profit, count) in daily.items()
+    ])
+    db.commit()
+    return len(daily)
+
+
+def ensure_daily_sales_rollup(db: Session) -> None:
+    has_rollup = db.query(models.DailySalesRollup.date).first() is not None
+    has_sales = (
+        db.query(models.Sale.id).first() is not None
+        or db.query(models.Order.id).first() is not None
+    )
+    if has_sales and not has_rollup:
+        rebuild_daily_sales_rollup(db)
+
+
 # ==================== ANALYTICS & REPORTING ====================
-def financial_summary(db: Session) -> dict:
-    sales = db.query(models.Sale).all()
-    purchases = db.query(models.Purchase).all()
-    products = db.query(models.Product).filter(models.Product.is_active == True).all()
-    customers = db.query(models.Customer).filter(models.Customer.is_active == True).count()
-    suppliers = db.query(models.Supplier).filter(models.Supplier.is_active == True).count()
-
-    total_revenue = sum(s.total_amount for s in sales)
-    total_expenses = sum(p.total_amount for p in purchases)
-    outstanding = sum(s.total_amount - s.paid_amount for s in sales if not s.is_fully_paid)
-    net_profit = sum(s.profit for s in sales)
-    low_stock = len([p for p in products if p.stock_qty <= p.min_stock_level])
+# Each report is a query builder plus a row shaper shared by the sync
+# function and its async variant.
+def _entity_counts_query():
+    product = models.Product
+    active = product.is_active == True
+    return select(
+        select(func.count(product.id)).where(active).scalar_subquery(),
+        select(func.count(product.id)).where(
+            active, product.stock_qty <= product.min_stock_level
+        ).scalar_subquery(),
+        select(func.count(models.Customer.id)).where(models.Customer.is_active == True).scalar_subquery(),
+        select(func.count(models.Supplier.id)).where(models.Supplier.is_active == True).scalar_subquery()
+    )
+
+
+def _financial_summary(db_totals: Optional[models.FinancialTotals], totals: dict, counts) -> dict:
+    if db_totals:
+        totals = {key: getattr(db_totals, key) for key in FINANCIAL_TOTALS_FIELDS}
+    total_products, low_stock, customers, suppliers = counts
 
     return {
-        "total_revenue": total_revenue,
-        "total_expenses": total_expenses,
-        "outstanding_receivables": outstanding,
-        "net_profit": net_profit,
-        "total_products": len(products),
+        "total_revenue": totals["total_revenue"],
+        "total_expenses": totals["total_expenses"],
+        "outstanding_receivables": totals["outstanding_receivables"],
+        "net_profit": totals["net_profit"],
+        "total_products": total_products,
         "low_stock_count": low_stock,
         "total_customers": customers,
         "total_suppliers": suppliers
     }
 
 
-def get_customer_debts(db: Session) -> List[dict]:
-    customers = db.query(models.Customer).filter(models.Customer.is_active == True).all()
-    debts = []
-
-    for customer in customers:
-        unpaid_sales = db.query(models.Sale).filter(
-            models.Sale.customer_id == customer.id,
-            models.Sale.is_fully_paid == False
-        ).all()
-
-        if unpaid_sales:
-            total_owed = sum(s.total_amount - s.paid_amount for s in unpaid_sales)
-            last_sale = max(unpaid_sales, key=lambda x: x.date)
-            debts.append({
-                "customer_id": customer.id,
-                "customer_name": customer.name,
-                "customer_phone": customer.phone,
-                "total_owed": total_owed,
-                "sales_count": len(unpaid_sales),
-                "last_sale_date": last_sale.date
-            })
+def financial_summary(db: Session) -> dict:
+    db_totals = get_financial_totals(db)
+    totals = None if db_totals else compute_financial_totals(db)
+    return _financial_summary(db_totals, totals, db.execute(_entity_counts_query()).one())
+
+
+async def financial_summary_async(db: AsyncSession) -> dict:
+    db_totals = (await db.scalars(_financial_totals_query())).first()
+    # The ledger row only goes missing before startup has seeded it
+    totals = None if db_totals else await db.run_sync(compute_financial_totals)
+    counts = (await db.execute(_entity_counts_query())).one()
+    return _financial_summary(db_totals, totals, counts)
+
+
+def _unpaid_balances():
+    return union_all(*[
+        select(
+            model.customer_id.label("customer_id"),
+            (model.total_amount - model.paid_amount).label("owed"),
+            model.date.label("date")
+        ).where(model.is_fully_paid == False)
+        for model in (models.Sale, models.Order)
+    ]).subquery()
+
+
+def _customer_debts_query(skip: int, limit: Optional[int]):
+    unpaid = _unpaid_balances()
+
+    total_owed = func.sum(unpaid.c.owed).label("total_owed")
+    query = select(
+        models.Customer.id,
+        models.Customer.name,
+        models.Customer.phone,
+        total_owed,
+        func.count(),
+        func.max(unpaid.c.date)
+    ).join(unpaid, unpaid.c.customer_id == models.Customer.id).where(
+        models.Customer.is_active == True
+    ).group_by(
+        models.Customer.id, models.Customer.name, models.Customer.phone
+    ).order_by(desc(total_owed), models.Customer.id).offset(skip)
+    if limit is not None:
+        query = query.limit(limit)
+    return query
+
+
+def count_debtors(db: Session) -> int:
+    unpaid = _unpaid_balances()
+    return db.scalar(
+        select(func.count(func.distinct(unpaid.c.customer_id))).join(
+            models.Customer, models.Customer.id == unpaid.c.customer_id
+        ).where(models.Customer.is_active == True)
+    )
+
+
+def _customer_debt_rows(rows) -> List[dict]:
+    return [
+        {
+            "customer_id": customer_id,
+            "customer_name": name,
+            "customer_phone": phone,
+            "total_owed": owed,
+            "sales_count": sales_count,
+            "last_sale_date": last_sale_date
+        }
+        for customer_id, name, phone, owed, sales_count, last_sale_date in rows
+    ]
 
-    return sorted(debts, key=lambda x: x["total_owed"], reverse=True)
 
+def get_customer_debts(db: Session, skip: int = 0, limit: Optional[int] = None) -> List[dict]:
+    return _customer_debt_rows(db.execute(_customer_debts_query(skip, limit)).all())
+
+
+async def get_customer_debts_async(db: AsyncSession, skip: int = 0, limit: Optional[int] = None) -> List[dict]:
+    return _customer_debt_rows((await db.execute(_customer_debts_query(skip, limit))).all())
+
+
+def _sales_trend_window(days: int, granularity: str) -> tuple:
+    if granularity not in TREND_GRANULARITIES:
+        raise ValueError(f"Invalid granularity. Use one of: {', '.join(TREND_GRANULARITIES)}")
 
-def get_sales_trend(db: Session, days: int = 30) -> List[dict]:
     end_date = datetime.utcnow().date()
-    start_date = end_date - timedelta(days=days)
+    return end_date - timedelta(days=days), end_date
 
-    sales = db.query(models.Sale).filter(models.Sale.date >= start_date).all()
 
-    daily_data = {}
-    for sale in sales:
-        date_str = sale.date.isoformat()
-        if date_str not in daily_data:
-            daily_data[date_str] = {"revenue": 0, "profit": 0, "sales_count": 0}
-        daily_data[date_str]["revenue"] += sale.total_amount
-        daily_data[date_str]["profit"] += sale.profit
-        daily_data[date_str]["sales_count"] += 1
+def _sales_trend_query(start_date: date, end_date: date):
+    return select(models.DailySalesRollup).where(
+        models.DailySalesRollup.date >= start_date,
+        models.DailySalesRollup.date <= end_date
+    )
 
-    return [
-        {"date": date, **data}
-        for date, data in sorted(daily_data.items())
-    ]
 
+def _sales_trend_buckets(rollups, start_date: date, end_date: date, granularity: str) -> List[dict]:
+    rollups_by_date = {r.date: r for r in rollups}
 
-def get_top_products(db: Session, limit: int = 5) -> List[dict]:
-    products = db.query(models.Product).filter(models.Product.is_active == True).all()
-    product_stats = []
+    buckets = {}
+    day = start_date
+    while day <= end_date:
+        key = _trend_bucket(day, granularity).isoformat()
+        bucket = buckets.setdefault(key, {"revenue": 0, "profit": 0, "sales_count": 0})
+        rollup = rollups_by_date.get(day)
+        if rollup:
+            bucket["revenue"] += rollup.revenue
+            bucket["profit"] += rollup.profit
+            bucket["sales_count"] += rollup.sales_count
+        day += timedelta(days=1)
 
-    for product in products:
-        sales = db.query(models.Sale).filter(models.Sale.product_id == product.id).all()
-        if sales:
-            total_sold = sum(s.qty for s in sales)
-            revenue = sum(s.total_amount for s in sales)
-            profit = sum(s.profit for s in sales)
-            product_stats.append({
-                "product_id": product.id,
-                "product_name": product.name,
-                "total_sold": total_sold,
-                "revenue": revenue,
-                "profit": profit
-            })
+    return [{"date": key, **data} for key, data in buckets.items()]
 
-    return sorted(product_stats, key=lambda x: x["revenue"], reverse=True)[:limit]
 
+def get_sales_trend(db: Session, days: int = 30, granularity: str = "day") -> List[dict]:
+    start_date, end_date = _sales_trend_window(days, granularity)
+    rollups = db.scalars(_sales_trend_query(start_date, end_date)).all()
+    return _sales_trend_buckets(rollups, start_date, end_date, granularity)
 
-def get_dashboard_stats(db: Session) -> dict:
-    financial = financial_summary(db)
-    recent_sales = get_sales(db, limit=5)
-    recent_purchases = get_purchases(db, limit=5)
-    top_products = get_top_products(db)
-    customer_debts = get_customer_debts(db)
-    sales_trend = get_sales_trend(db)
-    low_stock = get_low_stock_products(db)
 
-    return {
-        "financial": financial,
-        "recent_sales": recent_sales,
-        "recent_purchases": recent_purchases,
-        "top_products": top_products,
-        "customer_debts": customer_debts,
-        "sales_trend": sales_trend,
-        "low_stock_products": low_stock
+async def get_sales_trend_async(db: AsyncSession, days: int = 30, granularity: str = "day") -> List[dict]:
+    start_date, end_date = _sales_trend_window(days, granularity)
+    rollups = (await db.scalars(_sales_trend_query(start_date, end_date))).all()
+    return _sales_trend_buckets(rollups, start_date, end_date, granularity)
+
+
+def _top_products_query(
+    limit: int,
+    date_from: Optional[date],
+    date_to: Optional[date],
+    category_id: Optional[int]
+):
+    sale_lines = select(
+        models.Sale.product_id.label("product_id"),
+        models.Sale.qty.label("qty"),
+        models.Sale.total_amount.label("revenue"),
+        models.Sale.profit.label("profit")
+    )
+    order_lines = select(
+        models.OrderLine.product_id,
+        models.OrderLine.qty,
+        models.OrderLine.total_amount,
+        models.OrderLine.profit
+    ).join(models.Order, models.OrderLine.order_id == models.Order.id)
+    if date_from:
+        sale_lines = sale_lines.where(models.Sale.date >= date_from)
+        order_lines = order_lines.where(models.Order.date >= date_from)
+    if date_to:
+        sale_lines = sale_lines.where(models.Sale.date <= date_to)
+        order_lines = order_lines.where(models.Order.date <= date_to)
+    sold = union_all(sale_lines, order_lines).subquery()
+
+    revenue = func.sum(sold.c.revenue).label("revenue")
+    query = select(
+        models.Product.id,
+        models.Product.name,
+        func.sum(sold.c.qty),
+        revenue,
+        func.sum(sold.c.profit)
+    ).join(sold, sold.c.product_id == models.Product.id).where(
+        models.Product.is_active == True
+    )
+    if category_id is not None:
+        query = query.where(models.Product.category_id == category_id)
+
+    return query.group_by(models.Product.id, models.Product.name).order_by(
+        desc(revenue), models.Product.id
+    ).limit(limit)
+
+
+def _top_product_rows(rows) -> List[dict]:
+    return [
+        {
+            "product_id": product_id,
+            "product_name": name,
+            "total_sold": total_sold,
+            "revenue": product_revenue,
+            "profit": profit
+        }
+        for product_id, name, total_sold, product_revenue, profit in rows
+    ]
+
+
+def get_top_products(
+    db: Session,
+    limit: int = 5,
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    category_id: Optional[int] = None
+) -> List[dict]:
+    query = _top_products_query(limit, date_from, date_to, category_id)
+    return _top_product_rows(db.execute(query).all())
+
+
+async def get_top_products_async(
+    db: AsyncSession,
+    limit: int = 5,
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    category_id: Optional[int] = None
+) -> List[dict]:
+    query = _top_products_query(limit, date_from, date_to, category_id)
+    return _top_product_rows((await db.execute(query)).all())
+
+
+# ==================== DASHBOARD ====================
+# Each dashboard section runs on its own pooled session in parallel, and the
+# assembled payload is cached briefly and dropped on sale, purchase or
+# payment writes so concurrent viewers share one computation.
+DASHBOARD_CACHE_KEY = "dashboard"
+DASHBOARD_RECENT_LIMIT = 5
+DASHBOARD_DEBTS_LIMIT = 5
+
+DASHBOARD_SECTIONS = {
+    "financial": financial_summary,
+    "recent_sales": lambda db: [
+        schemas.SaleOut.model_validate(s) for s in get_sales(db, limit=DASHBOARD_RECENT_LIMIT)
+    ],
+    "recent_purchases": lambda db: [
+        schemas.PurchaseOut.model_validate(p) for p in get_purchases(db, limit=DASHBOARD_RECENT_LIMIT)
+    ],
+    "top_products": get_top_products,
+    "customer_debts": lambda db: get_customer_debts(db, limit=DASHBOARD_DEBTS_LIMIT),
+    "debtor_count": count_debtors,
+    "sales_trend": get_sales_trend,
+    "low_stock_products": lambda db: [
+        schemas.ProductOut.model_validate(p) for p in get_low_stock_products(db)
+    ],
+}
+
+_dashboard_executor = ThreadPoolExecutor(
+    max_workers=settings.DASHBOARD_WORKERS, thread_name_prefix="dashboard"
+)
+_dashboard_cache = TTLCache(ttl=settings.DASHBOARD_CACHE_TTL_SECONDS, maxsize=1)
+
+
+def _run_dashboard_section(session_factory, section) -> object:
+    db = session_factory()
+    try:
+        return section(db)
+    finally:
+        db.close()
+
+
+def _compute_dashboard_stats(session_factory) -> dict:
+    futures = {
+        name: _dashboard_executor.submit(_run_dashboard_section, session_factory, section)
+        for name, section in DASHBOARD_SECTIONS.items()
     }
+    return {name: future.result() for name, future in futures.items()}
+
+
+def get_dashboard_stats(session_factory=SessionLocal) -> dict:
+    return _dashboard_cache.get_or_set(
+        DASHBOARD_CACHE_KEY, lambda: _compute_dashboard_stats(session_factory)
+    )
+
+
+def invalidate_dashboard_cache() -> None:
+    _dashboard_cache.clear()
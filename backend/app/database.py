@@ -1,11 +1,59 @@
-from sqlalchemy import create_engine
+from datetime import datetime
+from sqlalchemy import DateTime, column, create_engine, event, select, table
+from sqlalchemy.engine import make_url
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker, declarative_base
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+from starlette.concurrency import run_in_threadpool
+from .cache import TTLCache
 from .config import settings
 
-engine = create_engine(
-    settings.DATABASE_URL,
-    connect_args={"check_same_thread": False} if "sqlite" in settings.DATABASE_URL else {}
-)
+
+def _apply_sqlite_pragmas(dbapi_connection, connection_record) -> None:
+    # journal_mode=WAL lets readers and the single writer proceed concurrently;
+    # busy_timeout makes a blocked writer wait instead of failing with
+    # "database is locked".
+    cursor = dbapi_connection.cursor()
+    cursor.execute(f"PRAGMA journal_mode={settings.SQLITE_JOURNAL_MODE}")
+    cursor.execute(f"PRAGMA synchronous={settings.SQLITE_SYNCHRONOUS}")
+    cursor.execute(f"PRAGMA busy_timeout={int(settings.SQLITE_BUSY_TIMEOUT_MS)}")
+    cursor.execute(f"PRAGMA cache_size=-{int(settings.SQLITE_CACHE_SIZE_KB)}")
+    cursor.execute(f"PRAGMA mmap_size={int(settings.SQLITE_MMAP_SIZE)}")
+    cursor.close()
+
+
+def _pool_options() -> dict:
+    return {
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+    }
+
+
+def create_db_engine(url: str, tuned: bool = True):
+    if url.startswith("sqlite"):
+        if not tuned:
+            return create_engine(url, connect_args={"check_same_thread": False})
+        # In-memory databases live on a single shared connection, not a pool
+        in_memory = url in ("sqlite://", "sqlite:///:memory:")
+        engine = create_engine(
+            url,
+            connect_args={"check_same_thread": False},
+            **({} if in_memory else _pool_options())
+        )
+        if settings.SQLITE_PRAGMAS_ENABLED:
+            event.listen(engine, "connect", _apply_sqlite_pragmas)
+        return engine
+    return create_engine(
+        url,
+        pool_recycle=settings.DB_POOL_RECYCLE,
+        pool_pre_ping=True,
+        **_pool_options()
+    )
+
+
+engine = create_db_engine(settings.DATABASE_URL)
 
 SessionLocal = sessionmaker(bind=engine, autocommit=False, autoflush=False)
 
@@ -17,3 +65,115 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+# Analytics and exports read from READ_DATABASE_URL when it is set. The replica
+# is only used while its copy of the ledger row, which every sale, purchase and
+# payment touches, is within READ_REPLICA_MAX_LAG_SECONDS of the primary's;
+# otherwise, or when it cannot be reached, reads go to the primary. The check is
+# cached for READ_REPLICA_CHECK_INTERVAL_SECONDS.
+read_engine = create_db_engine(settings.READ_DATABASE_URL) if settings.READ_DATABASE_URL else None
+
+ReadSessionLocal = (
+    sessionmaker(bind=read_engine, autocommit=False, autoflush=False) if read_engine else SessionLocal
+)
+
+_ledger_heartbeat = select(
+    table("financial_totals", column("id"), column("updated_at", DateTime)).c.updated_at
+).where(column("id") == 1)
+_replica_state = TTLCache(ttl=settings.READ_REPLICA_CHECK_INTERVAL_SECONDS, maxsize=1)
+
+
+def _ledger_updated_at(bind) -> datetime:
+    with bind.connect() as connection:
+        return connection.execute(_ledger_heartbeat).scalar()
+
+
+def replica_lag_seconds() -> float:
+    primary = _ledger_updated_at(engine)
+    replica = _ledger_updated_at(read_engine)
+    if primary is None:
+        return 0.0
+    if replica is None:
+        return float("inf")
+    return max((primary - replica).total_seconds(), 0.0)
+
+
+def _replica_is_fresh() -> bool:
+    try:
+        return replica_lag_seconds() <= settings.READ_REPLICA_MAX_LAG_SECONDS
+    except SQLAlchemyError:
+        return False
+
+
+def _use_replica() -> bool:
+    return read_engine is not None and _replica_state.get_or_set("fresh", _replica_is_fresh)
+
+
+def get_read_session_factory():
+    return ReadSessionLocal if _use_replica() else SessionLocal
+
+
+def get_read_db():
+    db = get_read_session_factory()()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+# Async engines for the hot read endpoints. They share DATABASE_URL and
+# READ_DATABASE_URL with the sync engines, swapping in an asyncio driver, so
+# async routes serve many concurrent requests from the event loop instead of
+# each holding a threadpool worker.
+ASYNC_DRIVERS = {"sqlite": "aiosqlite", "postgresql": "asyncpg"}
+
+
+def _async_url(url: str):
+    url = make_url(url)
+    driver = ASYNC_DRIVERS.get(url.get_backend_name())
+    return url.set(drivername=f"{url.get_backend_name()}+{driver}") if driver else url
+
+
+def create_async_db_engine(url: str):
+    url = _async_url(url)
+    if url.get_backend_name() == "sqlite":
+        in_memory = url.database in (None, "", ":memory:")
+        # aiosqlite defaults to a NullPool for files; opening a connection
+        # starts a thread, so pool them like the sync engine does
+        engine = create_async_engine(
+            url,
+            **({} if in_memory else {"poolclass": AsyncAdaptedQueuePool, **_pool_options()})
+        )
+        if settings.SQLITE_PRAGMAS_ENABLED:
+            event.listen(engine.sync_engine, "connect", _apply_sqlite_pragmas)
+        return engine
+    return create_async_engine(
+        url,
+        pool_recycle=settings.DB_POOL_RECYCLE,
+        pool_pre_ping=True,
+        **_pool_options()
+    )
+
+
+async_engine = create_async_db_engine(settings.DATABASE_URL)
+async_read_engine = create_async_db_engine(settings.READ_DATABASE_URL) if settings.READ_DATABASE_URL else None
+
+AsyncSessionLocal = async_sessionmaker(async_engine, expire_on_commit=False, autoflush=False)
+AsyncReadSessionLocal = (
+    async_sessionmaker(async_read_engine, expire_on_commit=False, autoflush=False)
+    if async_read_engine else AsyncSessionLocal
+)
+
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+async def get_async_read_db():
+    # The lag check is a blocking query, but it is cached and only runs when a
+    # replica is configured
+    use_replica = async_read_engine is not None and await run_in_threadpool(_use_replica)
+    async with (AsyncReadSessionLocal if use_replica else AsyncSessionLocal)() as db:
+        yield db
@@ -0,0 +1,215 @@
+import csv
+import io
+import tempfile
+from typing import Callable, Iterator
+
+from fastapi.responses import StreamingResponse
+from openpyxl import Workbook
+from sqlalchemy import desc
+from sqlalchemy.orm import Session
+
+from . import crud, models
+from .database import SessionLocal
+
+# Reports are paged out of the database with yield_per and written row by row,
+# either as chunked CSV straight to the response or into a write-only XLSX
+# workbook spooled to a temporary file, so memory stays flat however many
+# rows are exported.
+EXPORT_CHUNK_SIZE = 1000
+# An Excel sheet holds 1,048,576 rows; longer XLSX reports continue on
+# further sheets, each starting with the header row.
+XLSX_ROWS_PER_SHEET = 1048576 - 1
+EXPORT_FORMATS = {
+    "xlsx": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+    "csv": "text/csv",
+}
+
+
+def _sales_rows(db: Session) -> Iterator[tuple]:
+    query = db.query(
+        models.Sale.id,
+        models.Sale.date,
+        models.Customer.name,
+        models.Product.name,
+        models.Sale.qty,
+        models.Sale.selling_price,
+        models.Sale.total_amount,
+        models.Sale.paid_amount,
+        models.Sale.profit,
+        models.Sale.is_fully_paid
+    ).outerjoin(models.Customer, models.Sale.customer_id == models.Customer.id).outerjoin(
+        models.Product, models.Sale.product_id == models.Product.id
+    ).order_by(desc(models.Sale.date), desc(models.Sale.id)).yield_per(EXPORT_CHUNK_SIZE)
+
+    for sale_id, sale_date, customer, product, qty, price, total, paid, profit, is_fully_paid in query:
+        yield (
+            sale_id,
+            sale_date,
+            customer or "N/A",
+            product or "N/A",
+            qty,
+            price,
+            total,
+            paid,
+            total - paid,
+            profit,
+            "Paid" if is_fully_paid else "Pending"
+        )
+
+
+def _purchases_rows(db: Session) -> Iterator[tuple]:
+    query = db.query(
+        models.Purchase.id,
+        models.Purchase.date,
+        models.Supplier.name,
+        models.Product.name,
+        models.Purchase.qty,
+        models.Purchase.purchase_price,
+        models.Purchase.total_amount
+    ).outerjoin(models.Supplier, models.Purchase.supplier_id == models.Supplier.id).outerjoin(
+        models.Product, models.Purchase.product_id == models.Product.id
+    ).order_by(desc(models.Purchase.date), desc(models.Purchase.id)).yield_per(EXPORT_CHUNK_SIZE)
+
+    for purchase_id, purchase_date, supplier, product, qty, price, total in query:
+        yield (purchase_id, purchase_date, supplier or "N/A", product or "N/A", qty, price, total)
+
+
+def _inventory_rows(db: Session) -> Iterator[tuple]:
+    query = db.query(
+        models.Product.id,
+        models.Product.sku,
+        models.Product.name,
+        models.Category.name,
+        models.Product.stock_qty,
+        models.Product.min_stock_level,
+        models.Product.cost_price,
+        models.Product.sell_price
+    ).outerjoin(models.Category, models.Product.category_id == models.Category.id).filter(
+        models.Product.is_active == True
+    ).order_by(models.Product.id).yield_per(EXPORT_CHUNK_SIZE)
+
+    for product_id, sku, name, category, stock_qty, min_stock_level, cost_price, sell_price in query:
+        yield (
+            product_id,
+            sku or "N/A",
+            name,
+            category or "N/A",
+            stock_qty,
+            min_stock_level,
+            cost_price,
+            sell_price,
+            stock_qty * cost_price,
+            "Low Stock" if stock_qty <= min_stock_level else "OK"
+        )
+
+
+def _debts_rows(db: Session) -> Iterator[tuple]:
+    for debt in crud.get_customer_debts(db):
+        yield (
+            debt["customer_id"],
+            debt["customer_name"],
+            debt["customer_phone"],
+            debt["total_owed"],
+            debt["sales_count"],
+            debt["last_sale_date"]
+        )
+
+
+REPORTS = {
+    "sales": {
+        "filename": "sales_report",
+        "sheet": "Sales Report",
+        "columns": ["ID", "Date", "Customer", "Product", "Quantity", "Unit Price", "Total",
+                    "Paid", "Outstanding", "Profit", "Status"],
+        "rows": _sales_rows,
+    },
+    "purchases": {
+        "filename": "purchases_report",
+        "sheet": "Purchases Report",
+        "columns": ["ID", "Date", "Supplier", "Product", "Quantity", "Unit Price", "Total"],
+        "rows": _purchases_rows,
+    },
+    "inventory": {
+        "filename": "inventory",
+        "sheet": "Inventory",
+        "columns": ["ID", "SKU", "Name", "Category", "Stock Qty", "Min Stock Level", "Cost Price",
+                    "Sell Price", "Stock Value", "Status"],
+        "rows": _inventory_rows,
+    },
+    "debts": {
+        "filename": "customer_debts",
+        "sheet": "Customer Debts",
+        "columns": ["Customer ID", "Customer Name", "Phone", "Amount Owed", "Unpaid Sales", "Last Sale Date"],
+        "rows": _debts_rows,
+    },
+}
+
+
+def _iter_file(file, chunk_size: int = 64 * 1024) -> Iterator[bytes]:
+    try:
+        while True:
+            chunk = file.read(chunk_size)
+            if not chunk:
+                break
+            yield chunk
+    finally:
+        file.close()
+
+
+def _stream_csv(report: dict, session_factory: Callable[[], Session]) -> Iterator[bytes]:
+    # The request-scoped session is closed before a streaming body is sent,
+    # so CSV rows are read through a session owned by the generator.
+    db = session_factory()
+    try:
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(report["columns"])
+        for i, row in enumerate(report["rows"](db), start=1):
+            writer.writerow(row)
+            if i % EXPORT_CHUNK_SIZE == 0:
+                yield buffer.getvalue().encode()
+                buffer.seek(0)
+                buffer.truncate()
+        yield buffer.getvalue().encode()
+    finally:
+        db.close()
+
+
+def _write_xlsx(report: dict, db: Session, rows_per_sheet: int = XLSX_ROWS_PER_SHEET):
+    workbook = Workbook(write_only=True)
+    sheet = None
+    for i, row in enumerate(report["rows"](db)):
+        if i % rows_per_sheet == 0:
+            part = i // rows_per_sheet + 1
+            sheet = workbook.create_sheet(report["sheet"] if part == 1 else f"{report['sheet']} ({part})")
+            sheet.append(report["columns"])
+        sheet.append(row)
+    if sheet is None:
+        workbook.create_sheet(report["sheet"]).append(report["columns"])
+
+    output = tempfile.TemporaryFile()
+    workbook.save(output)
+    output.seek(0)
+    return output
+
+
+def export_report(
+    name: str,
+    export_format: str,
+    db: Session,
+    session_factory: Callable[[], Session] = SessionLocal
+) -> StreamingResponse:
+    if export_format not in EXPORT_FORMATS:
+        raise ValueError(f"Invalid format. Use one of: {', '.join(EXPORT_FORMATS)}")
+
+    report = REPORTS[name]
+    if export_format == "csv":
+        body = _stream_csv(report, session_factory)
+    else:
+        body = _iter_file(_write_xlsx(report, db))
+
+    return StreamingResponse(
+        body,
+        media_type=EXPORT_FORMATS[export_format],
+        headers={"Content-Disposition": f"attachment; filename={report['filename']}.{export_format}"}
+    )
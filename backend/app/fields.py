@@ -0,0 +1,43 @@
+from functools import lru_cache
+from typing import List, Optional
+
+from pydantic import TypeAdapter, create_model
+
+# Sparse fieldsets for list endpoints. fields= picks top-level fields of the
+# list schema and expand= replaces slim nested references with their full
+# schemas. Each (schema, expansion) pair builds its model and validator once.
+
+
+def parse_names(value: Optional[str], allowed, parameter: str) -> frozenset:
+    names = frozenset(name.strip() for name in (value or "").split(",") if name.strip())
+    unknown = sorted(names - set(allowed))
+    if unknown:
+        raise ValueError(f"Unknown {parameter} '{unknown[0]}', expected any of: {', '.join(allowed)}")
+    return names
+
+
+@lru_cache(maxsize=None)
+def _expanded_model(model, nested: tuple):
+    if not nested:
+        return model
+    return create_model(
+        model.__name__, __base__=model, **{name: (Optional[schema], None) for name, schema in nested}
+    )
+
+
+@lru_cache(maxsize=None)
+def _list_adapter(model) -> TypeAdapter:
+    return TypeAdapter(List[model])
+
+
+def dump_list(
+    rows: list, model, expansions: Optional[dict] = None,
+    fields: Optional[str] = None, expand: Optional[str] = None
+) -> bytes:
+    expansions = expansions or {}
+    expand_names = parse_names(expand, expansions, "expand")
+    field_names = parse_names(fields, model.model_fields, "field")
+    nested = tuple(sorted((name, expansions[name]) for name in expand_names))
+    adapter = _list_adapter(_expanded_model(model, nested))
+    include = {"__all__": field_names | expand_names} if field_names else None
+    return adapter.dump_json(adapter.validate_python(rows, from_attributes=True), include=include)
@@ -0,0 +1,68 @@
+import csv
+import io
+from datetime import date, datetime
+from itertools import islice
+from typing import BinaryIO, Iterator, List
+from zipfile import BadZipFile
+
+from openpyxl import load_workbook
+from openpyxl.utils.exceptions import InvalidFileException
+
+# Uploaded manifests are read lazily, row by row, and handed to crud in
+# fixed-size chunks, so a large file never has to fit in memory at once.
+IMPORT_CHUNK_SIZE = 2000
+IMPORT_FORMATS = ("csv", "xlsx")
+
+
+def _normalize_header(value) -> str:
+    return str(value or "").strip().lower().replace(" ", "_")
+
+
+def _csv_rows(file: BinaryIO) -> Iterator[dict]:
+    reader = csv.reader(io.TextIOWrapper(file, encoding="utf-8-sig", newline=""))
+    header = [_normalize_header(h) for h in next(reader, [])]
+    for values in reader:
+        if any(v.strip() for v in values):
+            yield dict(zip(header, values))
+
+
+def _xlsx_rows(file: BinaryIO) -> Iterator[dict]:
+    try:
+        workbook = load_workbook(file, read_only=True, data_only=True)
+    except (InvalidFileException, BadZipFile, KeyError):
+        raise ValueError("Could not read XLSX file")
+    try:
+        rows = workbook.active.iter_rows(values_only=True)
+        header = [_normalize_header(h) for h in next(rows, ())]
+        for values in rows:
+            if any(v not in (None, "") for v in values):
+                yield dict(zip(header, values))
+    finally:
+        workbook.close()
+
+
+def detect_format(filename: str) -> str:
+    extension = (filename or "").rsplit(".", 1)[-1].lower()
+    if extension not in IMPORT_FORMATS:
+        raise ValueError(f"Unsupported file type. Use one of: {', '.join(IMPORT_FORMATS)}")
+    return extension
+
+
+def read_rows(file: BinaryIO, file_format: str) -> Iterator[dict]:
+    return _csv_rows(file) if file_format == "csv" else _xlsx_rows(file)
+
+
+def chunked(rows: Iterator[dict], size: int = IMPORT_CHUNK_SIZE) -> Iterator[List[dict]]:
+    while True:
+        chunk = list(islice(rows, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def parse_date(value) -> date:
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    return date.fromisoformat(str(value).strip())
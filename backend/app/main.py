@@ -1,8 +1,16 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from .database import engine, Base
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse
+from .database import engine, async_engine, async_read_engine, Base, SessionLocal
 from .routes import router
 from .config import settings
+from . import crud, search
+
+try:
+    from brotli_asgi import BrotliMiddleware
+except ImportError:
+    BrotliMiddleware = None
 
 # Create database tables
 Base.metadata.create_all(bind=engine)
@@ -10,7 +18,8 @@ Base.metadata.create_all(bind=engine)
 app = FastAPI(
     title=settings.APP_NAME,
     version=settings.APP_VERSION,
-    description="A comprehensive inventory management system with financial tracking, customer debt management, and analytics."
+    description="A comprehensive inventory management system with financial tracking, customer debt management, and analytics.",
+    default_response_class=ORJSONResponse
 )
 
 # CORS middleware
@@ -20,12 +29,54 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "X-Total-Count"],
 )
 
+# Compress responses for clients that accept it
+if BrotliMiddleware is not None:
+    app.add_middleware(
+        BrotliMiddleware,
+        quality=settings.BROTLI_QUALITY,
+        minimum_size=settings.COMPRESSION_MINIMUM_SIZE,
+        gzip_fallback=True
+    )
+else:
+    app.add_middleware(
+        GZipMiddleware,
+        minimum_size=settings.COMPRESSION_MINIMUM_SIZE,
+        compresslevel=settings.GZIP_COMPRESS_LEVEL
+    )
+
 # Include routes
 app.include_router(router, prefix="/api")
 
 
+@app.on_event("startup")
+def init_materialized_totals():
+    db = SessionLocal()
+    try:
+        crud.ensure_financial_totals(db)
+        crud.ensure_daily_sales_rollup(db)
+    finally:
+        db.close()
+
+
+@app.on_event("startup")
+def init_search_index():
+    db = SessionLocal()
+    try:
+        search.ensure_product_search_index(db)
+    finally:
+        db.close()
+
+
+@app.on_event("shutdown")
+async def dispose_async_engines():
+    await async_engine.dispose()
+    if async_read_engine is not None:
+        await async_read_engine.dispose()
+
+
 @app.get("/")
 def root():
     return {
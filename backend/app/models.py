@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Float, Boolean, Date, DateTime, ForeignKey, Text, Enum
+from sqlalchemy import Column, Integer, String, Float, Boolean, Date, DateTime, ForeignKey, Text, Enum, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 import enum
@@ -59,6 +59,14 @@ class Product(Base):
     purchases = relationship("Purchase", back_populates="product")
     sales = relationship("Sale", back_populates="product")
 
+    __table_args__ = (
+        Index("ix_products_active_id", "is_active", "id"),
+        Index(
+            "ix_products_active_stock", "stock_qty", "min_stock_level",
+            sqlite_where=is_active == True, postgresql_where=is_active == True
+        ),
+    )
+
 
 class Supplier(Base):
     __tablename__ = "suppliers"
@@ -88,6 +96,7 @@ class Customer(Base):
     created_at = Column(DateTime, default=datetime.utcnow)
 
     sales = relationship("Sale", back_populates="customer")
+    orders = relationship("Order", back_populates="customer")
     payments = relationship("Payment", back_populates="customer")
 
 
@@ -109,6 +118,13 @@ class Purchase(Base):
     product = relationship("Product", back_populates="purchases")
     user = relationship("User", back_populates="purchases")
 
+    __table_args__ = (
+        Index("ix_purchases_date_id", "date", "id"),
+        Index("ix_purchases_supplier_date", "supplier_id", "date"),
+        Index("ix_purchases_product_date", "product_id", "date"),
+        Index("ix_purchases_total_id", "total_amount", "id"),
+    )
+
 
 class Sale(Base):
     __tablename__ = "sales"
@@ -132,12 +148,69 @@ class Sale(Base):
     user = relationship("User", back_populates="sales")
     payments = relationship("Payment", back_populates="sale")
 
+    __table_args__ = (
+        Index("ix_sales_date_id", "date", "id"),
+        Index("ix_sales_customer_date", "customer_id", "date"),
+        Index("ix_sales_product_date", "product_id", "date"),
+        Index("ix_sales_paid_date", "is_fully_paid", "date"),
+        Index("ix_sales_total_id", "total_amount", "id"),
+        Index(
+            "ix_sales_unpaid_customer", "customer_id", "date",
+            sqlite_where=is_fully_paid == False, postgresql_where=is_fully_paid == False
+        ),
+    )
+
+
+class Order(Base):
+    __tablename__ = "orders"
+
+    id = Column(Integer, primary_key=True, index=True)
+    customer_id = Column(Integer, ForeignKey("customers.id"), nullable=False)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=True)
+    total_amount = Column(Float, nullable=False)
+    paid_amount = Column(Float, default=0)
+    is_fully_paid = Column(Boolean, default=False)
+    profit = Column(Float, nullable=False)
+    notes = Column(Text, nullable=True)
+    date = Column(Date, nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+    customer = relationship("Customer", back_populates="orders")
+    user = relationship("User")
+    lines = relationship("OrderLine", back_populates="order", cascade="all, delete-orphan")
+    payments = relationship("Payment", back_populates="order")
+
+    __table_args__ = (
+        Index("ix_orders_date_id", "date", "id"),
+        Index("ix_orders_customer_date", "customer_id", "date"),
+        Index(
+            "ix_orders_unpaid_customer", "customer_id", "date",
+            sqlite_where=is_fully_paid == False, postgresql_where=is_fully_paid == False
+        ),
+    )
+
+
+class OrderLine(Base):
+    __tablename__ = "order_lines"
+
+    id = Column(Integer, primary_key=True, index=True)
+    order_id = Column(Integer, ForeignKey("orders.id"), nullable=False, index=True)
+    product_id = Column(Integer, ForeignKey("products.id"), nullable=False, index=True)
+    qty = Column(Integer, nullable=False)
+    selling_price = Column(Float, nullable=False)
+    total_amount = Column(Float, nullable=False)
+    profit = Column(Float, nullable=False)
+
+    order = relationship("Order", back_populates="lines")
+    product = relationship("Product")
+
 
 class Payment(Base):
     __tablename__ = "payments"
 
     id = Column(Integer, primary_key=True, index=True)
-    sale_id = Column(Integer, ForeignKey("sales.id"), nullable=False)
+    sale_id = Column(Integer, ForeignKey("sales.id"), nullable=True)
+    order_id = Column(Integer, ForeignKey("orders.id"), nullable=True)
     customer_id = Column(Integer, ForeignKey("customers.id"), nullable=False)
     amount = Column(Float, nullable=False)
     payment_method = Column(String(50), default="cash")
@@ -146,8 +219,16 @@ class Payment(Base):
     created_at = Column(DateTime, default=datetime.utcnow)
 
     sale = relationship("Sale", back_populates="payments")
+    order = relationship("Order", back_populates="payments")
     customer = relationship("Customer", back_populates="payments")
 
+    __table_args__ = (
+        Index("ix_payments_date_id", "date", "id"),
+        Index("ix_payments_customer_date", "customer_id", "date"),
+        Index("ix_payments_sale_id", "sale_id"),
+        Index("ix_payments_order_id", "order_id"),
+    )
+
 
 class ActivityLog(Base):
     __tablename__ = "activity_logs"
@@ -159,3 +240,23 @@ class ActivityLog(Base):
     entity_id = Column(Integer, nullable=True)
     details = Column(Text, nullable=True)
     created_at = Column(DateTime, default=datetime.utcnow)
+
+
+class FinancialTotals(Base):
+    __tablename__ = "financial_totals"
+
+    id = Column(Integer, primary_key=True, index=True)
+    total_revenue = Column(Float, nullable=False, default=0)
+    total_expenses = Column(Float, nullable=False, default=0)
+    net_profit = Column(Float, nullable=False, default=0)
+    outstanding_receivables = Column(Float, nullable=False, default=0)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+
+class DailySalesRollup(Base):
+    __tablename__ = "daily_sales_rollup"
+
+    date = Column(Date, primary_key=True)
+    revenue = Column(Float, nullable=False, default=0)
+    profit = Column(Float, nullable=False, default=0)
+    sales_count = Column(Integer, nullable=False, default=0)
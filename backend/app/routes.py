@@ -1,17 +1,20 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from fastapi.responses import StreamingResponse
+from fastapi import APIRouter, Depends, File, Form, HTTPException, Query, Response, UploadFile, status
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from datetime import timedelta
-from typing import List
-import io
-import pandas as pd
-
-from .database import get_db
-from . import crud, schemas, models
+from datetime import date, timedelta
+from typing import List, Optional
+
+from .database import get_async_db, get_async_read_db, get_db, get_read_db, get_read_session_factory
+from . import crud, schemas
+from .exports import export_report
+from .fields import dump_list, parse_names
+from . import imports
 from .auth import (
     create_access_token,
     get_current_user,
     get_current_active_user,
+    get_current_active_user_async,
     require_admin,
     require_manager_or_admin
 )
@@ -20,18 +23,40 @@ from .config import settings
 router = APIRouter()
 
 
+def _set_next_cursor(response: Response, next_cursor: Optional[str]) -> None:
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+
+
+def _set_total_count(response: Response, total: int) -> None:
+    response.headers["X-Total-Count"] = str(total)
+
+
+def _list_response(
+    response: Response, rows: list, model, expansions: Optional[dict] = None,
+    fields: Optional[str] = None, expand: Optional[str] = None
+) -> Response:
+    try:
+        body = dump_list(rows, model, expansions, fields, expand)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    # A returned Response skips the injected one, so carry its headers over
+    headers = {key: value for key, value in response.headers.items() if key != "content-length"}
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
 # ==================== AUTH ROUTES ====================
 @router.post("/auth/register", response_model=schemas.UserOut)
-def register(user: schemas.UserCreate, db: Session = Depends(get_db)):
-    db_user = crud.get_user_by_email(db, email=user.email)
+async def register(user: schemas.UserCreate, db: Session = Depends(get_db)):
+    db_user = await run_in_threadpool(crud.get_user_by_email, db, user.email)
     if db_user:
         raise HTTPException(status_code=400, detail="Email already registered")
-    return crud.create_user(db=db, user=user)
+    return await crud.create_user_async(db=db, user=user)
 
 
 @router.post("/auth/login", response_model=schemas.Token)
-def login(user: schemas.UserLogin, db: Session = Depends(get_db)):
-    db_user = crud.authenticate_user(db, user.email, user.password)
+async def login(user: schemas.UserLogin, db: Session = Depends(get_db)):
+    db_user = await crud.authenticate_user_async(db, user.email, user.password)
     if not db_user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -47,14 +72,14 @@ def login(user: schemas.UserLogin, db: Session = Depends(get_db)):
 
 
 @router.get("/auth/me", response_model=schemas.UserOut)
-def get_current_user_info(current_user: models.User = Depends(get_current_active_user)):
+def get_current_user_info(current_user: schemas.UserOut = Depends(get_current_active_user)):
     return current_user
 
 
 @router.put("/auth/me", response_model=schemas.UserOut)
 def update_current_user(
     user_update: schemas.UserUpdate,
-    current_user: models.User = Depends(get_current_active_user),
+    current_user: schemas.UserOut = Depends(get_current_active_user),
     db: Session = Depends(get_db)
 ):
     return crud.update_user(db, current_user.id, user_update)
@@ -65,7 +90,7 @@ def update_current_user(
 def get_users(
     skip: int = 0,
     limit: int = 100,
-    current_user: models.User = Depends(require_admin),
+    current_user: schemas.UserOut = Depends(require_admin),
     db: Session = Depends(get_db)
 ):
     return crud.get_users(db, skip=skip, limit=limit)
@@ -74,7 +99,7 @@ def get_users(
 @router.get("/users/{user_id}", response_model=schemas.UserOut)
 def get_user(
     user_id: int,
-    current_user: models.User = Depends(require_admin),
+    current_user: schemas.UserOut = Depends(require_admin),
     db: Session = Depends(get_db)
 ):
     user = crud.get_user(db, user_id)
@@ -87,7 +112,7 @@ def get_user(
 def update_user(
     user_id: int,
     user_update: schemas.UserUpdate,
-    current_user: models.User = Depends(require_admin),
+    current_user: schemas.UserOut = Depends(require_admin),
     db: Session = Depends(get_db)
 ):
     user = crud.update_user(db, user_id, user_update)
@@ -100,7 +125,7 @@ def update_user(
 @router.post("/categories", response_model=schemas.CategoryOut)
 def create_category(
     category: schemas.CategoryCreate,
-    current_user: models.User = Depends(get_current_active_user),
+    current_user: schemas.UserOut = Depends(get_current_active_user),
     db: Session = Depends(get_db)
 ):
     return crud.create_category(db, category)
@@ -108,7 +133,7 @@ def create_category(
 
 @router.get("/categories", response_model=List[schemas.CategoryOut])
 def get_categories(
-    current_user: models.User = Depends(get_current_active_user),
+    current_user: schemas.UserOut = Depends(get_current_active_user),
     db: Session = Depends(get_db)
 ):
     return crud.get_categories(db)
@@ -118,26 +143,68 @@ def get_categories(
 @router.post("/products", response_model=schemas.ProductOut)
 def create_product(
     product: schemas.ProductCreate,
-    current_user: models.User = Depends(get_current_active_user),
+    current_user: schemas.UserOut = Depends(get_current_active_user),
     db: Session = Depends(get_db)
 ):
     return crud.create_product(db, product)
 
 
+@router.post("/products/bulk", response_model=schemas.ProductUpsertResult)
+def upsert_products(
+    payload: schemas.ProductBulkUpsert,
+    current_user: schemas.UserOut = Depends(get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    return crud.upsert_products(db, payload.products)
+
+
 @router.get("/products", response_model=List[schemas.ProductOut])
-def get_products(
+async def get_products(
+    response: Response,
     skip: int = 0,
     limit: int = 100,
-    current_user: models.User = Depends(get_current_active_user),
+    cursor: Optional[str] = None,
+    fields: Optional[str] = None,
+    current_user: schemas.UserOut = Depends(get_current_active_user_async),
+    db: AsyncSession = Depends(get_async_db)
+):
+    try:
+        products = await crud.get_products_async(db, skip=skip, limit=limit, cursor=cursor)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    _set_next_cursor(response, crud.next_page_cursor(products, limit, crud.PRODUCT_CURSOR_KEYS))
+    return _list_response(response, products, schemas.ProductOut, fields=fields)
+
+
+@router.get("/products/by-sku/{sku}", response_model=schemas.ProductScanOut)
+async def get_product_by_sku(
+    sku: str,
+    current_user: schemas.UserOut = Depends(get_current_active_user_async),
+    db: AsyncSession = Depends(get_async_db)
+):
+    product = await crud.get_product_for_scan_async(db, sku)
+    if not product:
+        raise HTTPException(status_code=404, detail="Product not found")
+    return product
+
+
+@router.get("/products/search", response_model=List[schemas.ProductOut])
+def search_products(
+    q: str,
+    limit: int = Query(20, ge=1, le=100),
+    current_user: schemas.UserOut = Depends(get_current_active_user),
     db: Session = Depends(get_db)
 ):
-    return crud.get_products(db, skip=skip, limit=limit)
+    try:
+        return crud.search_products(db, q, limit=limit)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
 
 @router.get("/products/{product_id}", response_model=schemas.ProductOut)
 def get_product(
     product_id: int,
-    current_user: models.User = Depends(get_current_active_user),
+    current_user: schemas.UserOut = Depends(get_current_active_user),
     db: Session = Depends(get_db)
 ):
     product = crud.get_product(db, product_id)
@@ -150,7 +217,7 @@ def get_product(
 def update_product(
     product_id: int,
     product_update: schemas.ProductUpdate,
-    current_user: models.User = Depends(get_current_active_user),
+    current_user: schemas.UserOut = Depends(get_current_active_user),
     db: Session = Depends(get_db)
 ):
     product = crud.update_product(db, product_id, product_update)
@@ -161,7 +228,7 @@ def update_product(
 
 @router.get("/products/alerts/low-stock", response_model=List[schemas.ProductOut])
 def get_low_stock(
-    current_user: models.User = Depends(get_current_active_user),
+    current_user: schemas.UserOut = Depends(get_current_active_user),
     db: Session = Depends(get_db)
 ):
     return crud.get_low_stock_products(db)
@@ -171,7 +238,7 @@ def get_low_stock(
 @router.post("/suppliers", response_model=schemas.SupplierOut)
 def create_supplier(
     supplier: schemas.SupplierCreate,
-    current_user: models.User = Depends(get_current_active_user),
+    current_user: schemas.UserOut = Depends(get_current_active_user),
     db: Session = Depends(get_db)
 ):
     return crud.create_supplier(db, supplier)
@@ -181,7 +248,7 @@ def create_supplier(
 def get_suppliers(
     skip: int = 0,
     limit: int = 100,
-    current_user: models.User = Depends(get_current_active_user),
+    current_user: schemas.UserOut = Depends(get_current_active_user),
     db: Session = Depends(get_db)
 ):
     return crud.get_suppliers(db, skip=skip, limit=limit)
@@ -190,7 +257,7 @@ def get_suppliers(
 @router.get("/suppliers/{supplier_id}", response_model=schemas.SupplierOut)
 def get_supplier(
     supplier_id: int,
-    current_user: models.User = Depends(get_current_active_user),
+    current_user: schemas.UserOut = Depends(get_current_active_user),
     db: Session = Depends(get_db)
 ):
     supplier = crud.get_supplier(db, supplier_id)
@@ -203,7 +270,7 @@ def get_supplier(
 def update_supplier(
     supplier_id: int,
     supplier_update: schemas.SupplierUpdate,
-    current_user: models.User = Depends(get_current_active_user),
+    current_user: schemas.UserOut = Depends(get_current_active_user),
     db: Session = Depends(get_db)
 ):
     supplier = crud.update_supplier(db, supplier_id, supplier_update)
@@ -216,7 +283,7 @@ def update_supplier(
 @router.post("/customers", response_model=schemas.CustomerOut)
 def create_customer(
     customer: schemas.CustomerCreate,
-    current_user: models.User = Depends(get_current_active_user),
+    current_user: schemas.UserOut = Depends(get_current_active_user),
     db: Session = Depends(get_db)
 ):
     return crud.create_customer(db, customer)
@@ -226,7 +293,7 @@ def create_customer(
 def get_customers(
     skip: int = 0,
     limit: int = 100,
-    current_user: models.User = Depends(get_current_active_user),
+    current_user: schemas.UserOut = Depends(get_current_active_user),
     db: Session = Depends(get_db)
 ):
     return crud.get_customers(db, skip=skip, limit=limit)
@@ -235,7 +302,7 @@ def get_customers(
 @router.get("/customers/{customer_id}", response_model=schemas.CustomerOut)
 def get_customer(
     customer_id: int,
-    current_user: models.User = Depends(get_current_active_user),
+    current_user: schemas.UserOut = Depends(get_current_active_user),
     db: Session = Depends(get_db)
 ):
     customer = crud.get_customer(db, customer_id)
@@ -248,7 +315,7 @@ def get_customer(
 def update_customer(
     customer_id: int,
     customer_update: schemas.CustomerUpdate,
-    current_user: models.User = Depends(get_current_active_user),
+    current_user: schemas.UserOut = Depends(get_current_active_user),
     db: Session = Depends(get_db)
 ):
     customer = crud.update_customer(db, customer_id, customer_update)
@@ -261,7 +328,7 @@ def update_customer(
 @router.post("/purchases", response_model=schemas.PurchaseOut)
 def create_purchase(
     purchase: schemas.PurchaseCreate,
-    current_user: models.User = Depends(get_current_active_user),
+    current_user: schemas.UserOut = Depends(get_current_active_user),
     db: Session = Depends(get_db)
 ):
     try:
@@ -270,20 +337,57 @@ def create_purchase(
         raise HTTPException(status_code=400, detail=str(e))
 
 
-@router.get("/purchases", response_model=List[schemas.PurchaseOut])
+@router.post("/purchases/import", response_model=schemas.PurchaseImportResult)
+def import_purchases(
+    file: UploadFile = File(...),
+    supplier_id: int = Form(...),
+    default_date: Optional[date] = Form(None),
+    current_user: schemas.UserOut = Depends(get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    try:
+        rows = imports.read_rows(file.file, imports.detect_format(file.filename))
+        return crud.import_purchases(
+            db, imports.chunked(rows), supplier_id, default_date or date.today(), current_user.id
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@router.get("/purchases", response_model=List[schemas.PurchaseListOut])
 def get_purchases(
+    response: Response,
     skip: int = 0,
     limit: int = 100,
-    current_user: models.User = Depends(get_current_active_user),
+    cursor: Optional[str] = None,
+    sort: Optional[str] = None,
+    include_total: bool = False,
+    fields: Optional[str] = None,
+    expand: Optional[str] = None,
+    filters: schemas.PurchaseFilters = Depends(),
+    current_user: schemas.UserOut = Depends(get_current_active_user),
     db: Session = Depends(get_db)
 ):
-    return crud.get_purchases(db, skip=skip, limit=limit)
+    try:
+        keys = crud.sort_keys(crud.PURCHASE_SORTS, sort)
+        expanded = parse_names(expand, schemas.PURCHASE_EXPANSIONS, "expand")
+        purchases = crud.get_purchases(
+            db, skip=skip, limit=limit, cursor=cursor, sort=sort, filters=filters, expand=expanded
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    _set_next_cursor(response, crud.next_page_cursor(purchases, limit, keys))
+    if include_total:
+        _set_total_count(response, crud.count_purchases(db, filters))
+    return _list_response(
+        response, purchases, schemas.PurchaseListOut, schemas.PURCHASE_EXPANSIONS, fields, expand
+    )
 
 
 @router.get("/purchases/{purchase_id}", response_model=schemas.PurchaseOut)
 def get_purchase(
     purchase_id: int,
-    current_user: models.User = Depends(get_current_active_user),
+    current_user: schemas.UserOut = Depends(get_current_active_user),
     db: Session = Depends(get_db)
 ):
     purchase = crud.get_purchase(db, purchase_id)
@@ -296,7 +400,7 @@ def get_purchase(
 @router.post("/sales", response_model=schemas.SaleOut)
 def create_sale(
     sale: schemas.SaleCreate,
-    current_user: models.User = Depends(get_current_active_user),
+    current_user: schemas.UserOut = Depends(get_current_active_user),
     db: Session = Depends(get_db)
 ):
     try:
@@ -305,20 +409,47 @@ def create_sale(
         raise HTTPException(status_code=400, detail=str(e))
 
 
-@router.get("/sales", response_model=List[schemas.SaleOut])
-def get_sales(
+@router.post("/sales/bulk", response_model=schemas.BulkSaleResult)
+def create_sales_bulk(
+    payload: schemas.SaleBulkCreate,
+    current_user: schemas.UserOut = Depends(get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    return crud.record_sales_bulk(db, payload.sales, current_user.id)
+
+
+@router.get("/sales", response_model=List[schemas.SaleListOut])
+async def get_sales(
+    response: Response,
     skip: int = 0,
     limit: int = 100,
-    current_user: models.User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    cursor: Optional[str] = None,
+    sort: Optional[str] = None,
+    include_total: bool = False,
+    fields: Optional[str] = None,
+    expand: Optional[str] = None,
+    filters: schemas.SaleFilters = Depends(),
+    current_user: schemas.UserOut = Depends(get_current_active_user_async),
+    db: AsyncSession = Depends(get_async_db)
 ):
-    return crud.get_sales(db, skip=skip, limit=limit)
+    try:
+        keys = crud.sort_keys(crud.SALE_SORTS, sort)
+        expanded = parse_names(expand, schemas.SALE_EXPANSIONS, "expand")
+        sales = await crud.get_sales_async(
+            db, skip=skip, limit=limit, cursor=cursor, sort=sort, filters=filters, expand=expanded
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    _set_next_cursor(response, crud.next_page_cursor(sales, limit, keys))
+    if include_total:
+        _set_total_count(response, await crud.count_sales_async(db, filters))
+    return _list_response(response, sales, schemas.SaleListOut, schemas.SALE_EXPANSIONS, fields, expand)
 
 
 @router.get("/sales/{sale_id}", response_model=schemas.SaleOut)
 def get_sale(
     sale_id: int,
-    current_user: models.User = Depends(get_current_active_user),
+    current_user: schemas.UserOut = Depends(get_current_active_user),
     db: Session = Depends(get_db)
 ):
     sale = crud.get_sale(db, sale_id)
@@ -327,11 +458,53 @@ def get_sale(
     return sale
 
 
+# ==================== ORDER ROUTES ====================
+@router.post("/orders", response_model=schemas.OrderOut)
+def create_order(
+    order: schemas.OrderCreate,
+    current_user: schemas.UserOut = Depends(get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    try:
+        return crud.record_order(db, order, current_user.id)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@router.get("/orders", response_model=List[schemas.OrderOut])
+def get_orders(
+    response: Response,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    current_user: schemas.UserOut = Depends(get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    try:
+        orders = crud.get_orders(db, skip=skip, limit=limit, cursor=cursor)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    _set_next_cursor(response, crud.next_page_cursor(orders, limit, crud.ORDER_CURSOR_KEYS))
+    return orders
+
+
+@router.get("/orders/{order_id}", response_model=schemas.OrderOut)
+def get_order(
+    order_id: int,
+    current_user: schemas.UserOut = Depends(get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    order = crud.get_order(db, order_id)
+    if not order:
+        raise HTTPException(status_code=404, detail="Order not found")
+    return order
+
+
 # ==================== PAYMENT ROUTES ====================
 @router.post("/payments", response_model=schemas.PaymentOut)
 def create_payment(
     payment: schemas.PaymentCreate,
-    current_user: models.User = Depends(get_current_active_user),
+    current_user: schemas.UserOut = Depends(get_current_active_user),
     db: Session = Depends(get_db)
 ):
     try:
@@ -342,175 +515,113 @@ def create_payment(
 
 @router.get("/payments", response_model=List[schemas.PaymentOut])
 def get_payments(
+    response: Response,
     skip: int = 0,
     limit: int = 100,
-    current_user: models.User = Depends(get_current_active_user),
+    cursor: Optional[str] = None,
+    current_user: schemas.UserOut = Depends(get_current_active_user),
     db: Session = Depends(get_db)
 ):
-    return crud.get_payments(db, skip=skip, limit=limit)
+    try:
+        payments = crud.get_payments(db, skip=skip, limit=limit, cursor=cursor)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    _set_next_cursor(response, crud.next_page_cursor(payments, limit, crud.PAYMENT_CURSOR_KEYS))
+    return payments
 
 
 # ==================== ANALYTICS ROUTES ====================
-@router.get("/analytics/dashboard")
+@router.get("/analytics/dashboard", response_model=schemas.DashboardStats)
 def get_dashboard(
-    current_user: models.User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    current_user: schemas.UserOut = Depends(get_current_active_user)
 ):
-    return crud.get_dashboard_stats(db)
+    return crud.get_dashboard_stats(session_factory=get_read_session_factory())
 
 
 @router.get("/analytics/finance", response_model=schemas.FinancialSummary)
-def get_finance(
-    current_user: models.User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+async def get_finance(
+    current_user: schemas.UserOut = Depends(get_current_active_user_async),
+    db: AsyncSession = Depends(get_async_read_db)
 ):
-    return crud.financial_summary(db)
+    return await crud.financial_summary_async(db)
 
 
 @router.get("/analytics/debts", response_model=List[schemas.CustomerDebt])
-def get_debts(
-    current_user: models.User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+async def get_debts(
+    skip: int = 0,
+    limit: Optional[int] = None,
+    current_user: schemas.UserOut = Depends(get_current_active_user_async),
+    db: AsyncSession = Depends(get_async_read_db)
 ):
-    return crud.get_customer_debts(db)
+    return await crud.get_customer_debts_async(db, skip=skip, limit=limit)
 
 
 @router.get("/analytics/sales-trend", response_model=List[schemas.SalesAnalytics])
-def get_sales_trend(
+async def get_sales_trend(
     days: int = 30,
-    current_user: models.User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    granularity: str = "day",
+    current_user: schemas.UserOut = Depends(get_current_active_user_async),
+    db: AsyncSession = Depends(get_async_read_db)
 ):
-    return crud.get_sales_trend(db, days=days)
+    try:
+        return await crud.get_sales_trend_async(db, days=days, granularity=granularity)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
 
 @router.get("/analytics/top-products", response_model=List[schemas.ProductAnalytics])
-def get_top_products(
+async def get_top_products(
     limit: int = 5,
-    current_user: models.User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
-):
-    return crud.get_top_products(db, limit=limit)
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    category_id: Optional[int] = None,
+    current_user: schemas.UserOut = Depends(get_current_active_user_async),
+    db: AsyncSession = Depends(get_async_read_db)
+):
+    return await crud.get_top_products_async(
+        db, limit=limit, date_from=date_from, date_to=date_to, category_id=category_id
+    )
 
 
 # ==================== EXPORT ROUTES ====================
+def _export(name: str, export_format: str, db: Session):
+    try:
+        return export_report(name, export_format, db, session_factory=get_read_session_factory())
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
 @router.get("/export/debts")
 def export_debts(
-    current_user: models.User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    format: str = "xlsx",
+    current_user: schemas.UserOut = Depends(get_current_active_user),
+    db: Session = Depends(get_read_db)
 ):
-    debts = crud.get_customer_debts(db)
-
-    df = pd.DataFrame(debts)
-    if not df.empty:
-        df.columns = ["Customer ID", "Customer Name", "Phone", "Amount Owed", "Unpaid Sales", "Last Sale Date"]
-
-    output = io.BytesIO()
-    df.to_excel(output, index=False, sheet_name="Customer Debts")
-    output.seek(0)
-
-    return StreamingResponse(
-        output,
-        media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-        headers={"Content-Disposition": "attachment; filename=customer_debts.xlsx"}
-    )
+    return _export("debts", format, db)
 
 
 @router.get("/export/sales")
 def export_sales(
-    current_user: models.User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
-):
-    sales = crud.get_sales(db, limit=1000)
-
-    data = []
-    for sale in sales:
-        data.append({
-            "ID": sale.id,
-            "Date": sale.date,
-            "Customer": sale.customer.name if sale.customer else "N/A",
-            "Product": sale.product.name if sale.product else "N/A",
-            "Quantity": sale.qty,
-            "Unit Price": sale.selling_price,
-            "Total": sale.total_amount,
-            "Paid": sale.paid_amount,
-            "Outstanding": sale.total_amount - sale.paid_amount,
-            "Profit": sale.profit,
-            "Status": "Paid" if sale.is_fully_paid else "Pending"
-        })
-
-    df = pd.DataFrame(data)
-    output = io.BytesIO()
-    df.to_excel(output, index=False, sheet_name="Sales Report")
-    output.seek(0)
-
-    return StreamingResponse(
-        output,
-        media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-        headers={"Content-Disposition": "attachment; filename=sales_report.xlsx"}
-    )
+    format: str = "xlsx",
+    current_user: schemas.UserOut = Depends(get_current_active_user),
+    db: Session = Depends(get_read_db)
+):
+    return _export("sales", format, db)
 
 
 @router.get("/export/purchases")
 def export_purchases(
-    current_user: models.User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
-):
-    purchases = crud.get_purchases(db, limit=1000)
-
-    data = []
-    for purchase in purchases:
-        data.append({
-            "ID": purchase.id,
-            "Date": purchase.date,
-            "Supplier": purchase.supplier.name if purchase.supplier else "N/A",
-            "Product": purchase.product.name if purchase.product else "N/A",
-            "Quantity": purchase.qty,
-            "Unit Price": purchase.purchase_price,
-            "Total": purchase.total_amount
-        })
-
-    df = pd.DataFrame(data)
-    output = io.BytesIO()
-    df.to_excel(output, index=False, sheet_name="Purchases Report")
-    output.seek(0)
-
-    return StreamingResponse(
-        output,
-        media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-        headers={"Content-Disposition": "attachment; filename=purchases_report.xlsx"}
-    )
+    format: str = "xlsx",
+    current_user: schemas.UserOut = Depends(get_current_active_user),
+    db: Session = Depends(get_read_db)
+):
+    return _export("purchases", format, db)
 
 
 @router.get("/export/inventory")
 def export_inventory(
-    current_user: models.User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
-):
-    products = crud.get_products(db, limit=1000)
-
-    data = []
-    for product in products:
-        data.append({
-            "ID": product.id,
-            "SKU": product.sku or "N/A",
-            "Name": product.name,
-            "Category": product.category.name if product.category else "N/A",
-            "Stock Qty": product.stock_qty,
-            "Min Stock Level": product.min_stock_level,
-            "Cost Price": product.cost_price,
-            "Sell Price": product.sell_price,
-            "Stock Value": product.stock_qty * product.cost_price,
-            "Status": "Low Stock" if product.stock_qty <= product.min_stock_level else "OK"
-        })
-
-    df = pd.DataFrame(data)
-    output = io.BytesIO()
-    df.to_excel(output, index=False, sheet_name="Inventory")
-    output.seek(0)
-
-    return StreamingResponse(
-        output,
-        media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-        headers={"Content-Disposition": "attachment; filename=inventory.xlsx"}
-    )
+    format: str = "xlsx",
+    current_user: schemas.UserOut = Depends(get_current_active_user),
+    db: Session = Depends(get_read_db)
+):
+    return _export("inventory", format, db)
@@ -1,4 +1,4 @@
-from pydantic import BaseModel, EmailStr, Field
+from pydantic import BaseModel, EmailStr, Field, model_validator
 from datetime import date, datetime
 from typing import Optional, List
 from .models import UserRole
@@ -86,6 +86,41 @@ class ProductUpdate(BaseModel):
     is_active: Optional[bool] = None
 
 
+class ProductRef(BaseModel):
+    id: int
+    name: str
+
+    class Config:
+        from_attributes = True
+
+
+class ProductScanOut(BaseModel):
+    id: int
+    sku: str
+    name: str
+    sell_price: float
+    stock_qty: int
+
+    class Config:
+        from_attributes = True
+
+
+class ProductBulkUpsert(BaseModel):
+    products: List[ProductCreate] = Field(..., min_length=1)
+
+    @model_validator(mode="after")
+    def check_skus(self) -> "ProductBulkUpsert":
+        if any(not product.sku for product in self.products):
+            raise ValueError("Every product needs a SKU for a bulk upsert")
+        return self
+
+
+class ProductUpsertResult(BaseModel):
+    created: int
+    updated: int
+    unchanged: int
+
+
 class ProductOut(BaseModel):
     id: int
     name: str
@@ -136,6 +171,14 @@ class SupplierOut(BaseModel):
         from_attributes = True
 
 
+class SupplierRef(BaseModel):
+    id: int
+    name: str
+
+    class Config:
+        from_attributes = True
+
+
 # ==================== CUSTOMER SCHEMAS ====================
 class CustomerCreate(BaseModel):
     name: str
@@ -168,6 +211,14 @@ class CustomerOut(BaseModel):
         from_attributes = True
 
 
+class CustomerRef(BaseModel):
+    id: int
+    name: str
+
+    class Config:
+        from_attributes = True
+
+
 # ==================== PURCHASE SCHEMAS ====================
 class PurchaseCreate(BaseModel):
     supplier_id: int
@@ -178,7 +229,9 @@ class PurchaseCreate(BaseModel):
     date: date
 
 
-class PurchaseOut(BaseModel):
+# List rows nest only the id and name of related records; expand= swaps in
+# the full schemas listed in PURCHASE_EXPANSIONS
+class PurchaseListOut(BaseModel):
     id: int
     supplier_id: int
     product_id: int
@@ -189,13 +242,50 @@ class PurchaseOut(BaseModel):
     notes: Optional[str]
     date: date
     created_at: datetime
-    supplier: Optional[SupplierOut] = None
-    product: Optional[ProductOut] = None
+    supplier: Optional[SupplierRef] = None
+    product: Optional[ProductRef] = None
 
     class Config:
         from_attributes = True
 
 
+class PurchaseOut(PurchaseListOut):
+    supplier: Optional[SupplierOut] = None
+    product: Optional[ProductOut] = None
+
+
+PURCHASE_EXPANSIONS = {"supplier": SupplierOut, "product": ProductOut}
+
+
+class PurchaseFilters(BaseModel):
+    supplier_id: Optional[int] = None
+    product_id: Optional[int] = None
+    date_from: Optional[date] = None
+    date_to: Optional[date] = None
+
+
+class ImportRowError(BaseModel):
+    row: int
+    error: str
+
+
+class ImportChunkProgress(BaseModel):
+    chunk: int
+    rows: int
+    imported: int
+    failed: int
+
+
+class PurchaseImportResult(BaseModel):
+    rows_processed: int
+    imported: int
+    failed: int
+    total_qty: int
+    total_amount: float
+    chunks: List[ImportChunkProgress]
+    errors: List[ImportRowError]
+
+
 # ==================== SALE SCHEMAS ====================
 class SaleCreate(BaseModel):
     customer_id: int
@@ -207,12 +297,24 @@ class SaleCreate(BaseModel):
     date: date
 
 
+class SaleBulkCreate(BaseModel):
+    sales: List[SaleCreate] = Field(..., min_length=1)
+
+
 class SaleUpdate(BaseModel):
     paid_amount: Optional[float] = None
     notes: Optional[str] = None
 
 
-class SaleOut(BaseModel):
+class SaleFilters(BaseModel):
+    customer_id: Optional[int] = None
+    product_id: Optional[int] = None
+    is_fully_paid: Optional[bool] = None
+    date_from: Optional[date] = None
+    date_to: Optional[date] = None
+
+
+class SaleListOut(BaseModel):
     id: int
     customer_id: int
     product_id: int
@@ -226,26 +328,101 @@ class SaleOut(BaseModel):
     notes: Optional[str]
     date: date
     created_at: datetime
+    customer: Optional[CustomerRef] = None
+    product: Optional[ProductRef] = None
+
+    class Config:
+        from_attributes = True
+
+
+class SaleOut(SaleListOut):
     customer: Optional[CustomerOut] = None
     product: Optional[ProductOut] = None
 
+
+SALE_EXPANSIONS = {"customer": CustomerOut, "product": ProductOut}
+
+
+class BulkItemResult(BaseModel):
+    index: int
+    success: bool
+    id: Optional[int] = None
+    error: Optional[str] = None
+
+
+class BulkSaleResult(BaseModel):
+    created: int
+    failed: int
+    results: List[BulkItemResult]
+
+
+# ==================== ORDER SCHEMAS ====================
+class OrderLineCreate(BaseModel):
+    product_id: int
+    qty: int
+    selling_price: float
+
+
+class OrderCreate(BaseModel):
+    customer_id: int
+    lines: List[OrderLineCreate] = Field(..., min_length=1)
+    paid_amount: float = 0
+    notes: Optional[str] = None
+    date: date
+
+
+class OrderLineOut(BaseModel):
+    id: int
+    product_id: int
+    qty: int
+    selling_price: float
+    total_amount: float
+    profit: float
+    product: Optional[ProductOut] = None
+
+    class Config:
+        from_attributes = True
+
+
+class OrderOut(BaseModel):
+    id: int
+    customer_id: int
+    user_id: Optional[int]
+    total_amount: float
+    paid_amount: float
+    is_fully_paid: bool
+    profit: float
+    notes: Optional[str]
+    date: date
+    created_at: datetime
+    customer: Optional[CustomerOut] = None
+    lines: List[OrderLineOut] = []
+
     class Config:
         from_attributes = True
 
 
 # ==================== PAYMENT SCHEMAS ====================
 class PaymentCreate(BaseModel):
-    sale_id: int
+    sale_id: Optional[int] = None
+    order_id: Optional[int] = None
     customer_id: int
     amount: float
     payment_method: str = "cash"
     notes: Optional[str] = None
     date: date
 
+    @model_validator(mode="after")
+    def check_target(self) -> "PaymentCreate":
+        if (self.sale_id is None) == (self.order_id is None):
+            raise ValueError("Provide exactly one of sale_id or order_id")
+        return self
+
 
 class PaymentOut(BaseModel):
     id: int
-    sale_id: int
+    sale_id: Optional[int]
+    order_id: Optional[int] = None
     customer_id: int
     amount: float
     payment_method: str
@@ -299,5 +476,6 @@ class DashboardStats(BaseModel):
     recent_purchases: List[PurchaseOut]
     top_products: List[ProductAnalytics]
     customer_debts: List[CustomerDebt]
+    debtor_count: int
     sales_trend: List[SalesAnalytics]
     low_stock_products: List[ProductOut]
@@ -0,0 +1,141 @@
+import re
+from typing import List
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+# Product search runs on a trigram index over name, SKU and description: an
+# FTS5 table kept in sync by triggers on SQLite, and a pg_trgm GIN index on
+# PostgreSQL. Trigrams give substring and prefix matches, and a query with no
+# exact hits is retried as an OR of its trigrams, ranked by how many of them a
+# product shares, which tolerates typos. On SQLite, names and SKUs that start
+# with the query are found first by range seeks on their B-tree indexes, then
+# every index match is ranked with bm25.
+SEARCH_MIN_TERM_LENGTH = 3
+
+SQLITE_SEARCH_DDL = (
+    "CREATE VIRTUAL TABLE IF NOT EXISTS products_fts USING fts5("
+    "name, sku, description, content='products', content_rowid='id', tokenize='trigram')",
+    "CREATE TRIGGER IF NOT EXISTS products_fts_ai AFTER INSERT ON products BEGIN "
+    "INSERT INTO products_fts(rowid, name, sku, description) "
+    "VALUES (new.id, new.name, new.sku, new.description); END",
+    "CREATE TRIGGER IF NOT EXISTS products_fts_ad AFTER DELETE ON products BEGIN "
+    "INSERT INTO products_fts(products_fts, rowid, name, sku, description) "
+    "VALUES ('delete', old.id, old.name, old.sku, old.description); END",
+    # Only text changes touch the index, so stock updates stay cheap
+    "CREATE TRIGGER IF NOT EXISTS products_fts_au AFTER UPDATE OF name, sku, description ON products BEGIN "
+    "INSERT INTO products_fts(products_fts, rowid, name, sku, description) "
+    "VALUES ('delete', old.id, old.name, old.sku, old.description); "
+    "INSERT INTO products_fts(rowid, name, sku, description) "
+    "VALUES (new.id, new.name, new.sku, new.description); END",
+)
+
+POSTGRES_SEARCH_DOCUMENT = "(coalesce(name, '') || ' ' || coalesce(sku, '') || ' ' || coalesce(description, ''))"
+
+POSTGRES_SEARCH_DDL = (
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    f"CREATE INDEX IF NOT EXISTS ix_products_search_trgm ON products "
+    f"USING gin ({POSTGRES_SEARCH_DOCUMENT} gin_trgm_ops)",
+)
+
+# bm25 column weights for name, sku, description
+SQLITE_SEARCH_QUERY = text(
+    "SELECT p.id FROM products_fts JOIN products p ON p.id = products_fts.rowid "
+    "WHERE products_fts MATCH :match AND p.is_active = 1 "
+    "ORDER BY bm25(products_fts, 5.0, 10.0, 1.0) LIMIT :limit"
+)
+
+POSTGRES_SEARCH_QUERY = text(
+    f"SELECT id FROM products WHERE is_active "
+    f"AND ({POSTGRES_SEARCH_DOCUMENT} ILIKE :pattern OR :query <% {POSTGRES_SEARCH_DOCUMENT}) "
+    f"ORDER BY :query <<-> {POSTGRES_SEARCH_DOCUMENT}, id LIMIT :limit"
+)
+
+
+def _dialect(db: Session) -> str:
+    return db.get_bind().dialect.name
+
+
+def _has_sqlite_index(db: Session) -> bool:
+    return db.execute(
+        text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'products_fts'")
+    ).first() is not None
+
+
+def rebuild_product_search_index(db: Session) -> None:
+    dialect = _dialect(db)
+    if dialect == "sqlite":
+        for statement in SQLITE_SEARCH_DDL:
+            db.execute(text(statement))
+        db.execute(text("INSERT INTO products_fts(products_fts) VALUES ('rebuild')"))
+    elif dialect == "postgresql":
+        for statement in POSTGRES_SEARCH_DDL:
+            db.execute(text(statement))
+    db.commit()
+
+
+def ensure_product_search_index(db: Session) -> None:
+    if _dialect(db) == "sqlite" and _has_sqlite_index(db):
+        return
+    rebuild_product_search_index(db)
+
+
+def _terms(query: str) -> List[str]:
+    return [term for term in re.split(r"\s+", query.strip().lower()) if term]
+
+
+def _quote(term: str) -> str:
+    return '"' + term.replace('"', '""') + '"'
+
+
+def _trigrams(term: str) -> List[str]:
+    return [term[i:i + SEARCH_MIN_TERM_LENGTH] for i in range(len(term) - SEARCH_MIN_TERM_LENGTH + 1)]
+
+
+def _sqlite_prefix_ids(db: Session, query: str, limit: int) -> List[int]:
+    # One index range per casing of the prefix, on name and on sku; unary +
+    # keeps the planner from scanning the is_active index instead
+    ranges = []
+    params = {"limit": limit}
+    for i, prefix in enumerate(dict.fromkeys([query, query.lower(), query.upper(), query.capitalize()])):
+        params[f"low{i}"] = prefix
+        params[f"high{i}"] = prefix[:-1] + chr(ord(prefix[-1]) + 1)
+        ranges.append(f"(name >= :low{i} AND name < :high{i})")
+        ranges.append(f"(sku >= :low{i} AND sku < :high{i})")
+    statement = text(f"SELECT id FROM products WHERE ({' OR '.join(ranges)}) AND +is_active = 1 LIMIT :limit")
+    return list(db.execute(statement, params).scalars())
+
+
+def _sqlite_match_ids(db: Session, match: str, limit: int) -> List[int]:
+    return list(db.execute(SQLITE_SEARCH_QUERY, {"match": match, "limit": limit}).scalars())
+
+
+def _sqlite_search(db: Session, query: str, limit: int) -> List[int]:
+    ids = _sqlite_prefix_ids(db, query.strip(), limit)
+    terms = [term for term in _terms(query) if len(term) >= SEARCH_MIN_TERM_LENGTH]
+    if len(ids) >= limit or not terms:
+        return ids
+
+    exact = " AND ".join(_quote(term) for term in terms)
+    matches = _sqlite_match_ids(db, exact, limit)
+    if not ids and not matches:
+        fuzzy = " OR ".join(_quote(trigram) for term in terms for trigram in dict.fromkeys(_trigrams(term)))
+        matches = _sqlite_match_ids(db, fuzzy, limit)
+    ids.extend(product_id for product_id in matches if product_id not in ids)
+    return ids[:limit]
+
+
+def _postgres_search(db: Session, query: str, limit: int) -> List[int]:
+    escaped = query.strip().replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return list(db.execute(POSTGRES_SEARCH_QUERY, {
+        "pattern": f"%{escaped}%", "query": query.strip(), "limit": limit
+    }).scalars())
+
+
+def search_product_ids(db: Session, query: str, limit: int) -> List[int]:
+    dialect = _dialect(db)
+    if dialect == "sqlite":
+        return _sqlite_search(db, query, limit)
+    if dialect == "postgresql":
+        return _postgres_search(db, query, limit)
+    raise ValueError(f"Product search is not supported on {dialect}")
@@ -0,0 +1,106 @@
+import threading
+from typing import Iterable, Optional
+
+from sqlalchemy import event, select
+from sqlalchemy.orm import Session
+
+from . import models
+from .cache import TTLCache
+from .config import settings
+
+# POS scans resolve a SKU from an in-process index of compact slotted
+# entries. Entries load on first scan, and any committed session that changed
+# a cached product (edit, bulk upsert, stock movement) reloads it right after
+# the commit. Writes made by other worker processes are picked up once an
+# entry is older than SKU_INDEX_TTL_SECONDS.
+SCAN_COLUMNS = (
+    models.Product.id,
+    models.Product.sku,
+    models.Product.name,
+    models.Product.sell_price,
+    models.Product.stock_qty,
+    models.Product.is_active,
+)
+_PENDING_KEY = "sku_index_pending"
+
+
+class ScanProduct:
+    __slots__ = ("id", "sku", "name", "sell_price", "stock_qty")
+
+    def __init__(self, id: int, sku: str, name: str, sell_price: float, stock_qty: int):
+        self.id = id
+        self.sku = sku
+        self.name = name
+        self.sell_price = sell_price
+        self.stock_qty = stock_qty
+
+
+class ProductSkuIndex:
+    def __init__(self, ttl: float, maxsize: int):
+        self._by_sku = TTLCache(ttl=ttl, maxsize=maxsize)
+        self._sku_by_id = {}
+        self._lock = threading.Lock()
+
+    def get(self, sku: str) -> Optional[ScanProduct]:
+        return self._by_sku.get(sku)
+
+    def store(self, row) -> Optional[ScanProduct]:
+        product_id, sku, name, sell_price, stock_qty, is_active = row
+        with self._lock:
+            previous_sku = self._sku_by_id.pop(product_id, None)
+            if previous_sku is not None and previous_sku != sku:
+                self._by_sku.invalidate(previous_sku)
+            if not is_active or sku is None:
+                self._by_sku.invalidate(sku)
+                return None
+            entry = ScanProduct(product_id, sku, name, sell_price, stock_qty)
+            self._sku_by_id[product_id] = sku
+            self._by_sku.set(sku, entry)
+            return entry
+
+    def cached_ids(self, product_ids: Iterable[int]) -> list:
+        with self._lock:
+            return [product_id for product_id in product_ids if product_id in self._sku_by_id]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._sku_by_id.clear()
+            self._by_sku.clear()
+
+
+product_sku_index = ProductSkuIndex(ttl=settings.SKU_INDEX_TTL_SECONDS, maxsize=settings.SKU_INDEX_MAX_SIZE)
+
+
+def scan_query(sku: str):
+    return select(*SCAN_COLUMNS).where(models.Product.sku == sku, models.Product.is_active == True)
+
+
+def track_products(db: Session, product_ids: Iterable[int] = (), skus: Iterable[str] = ()) -> None:
+    # Called by writes that touch products; the reload happens only on commit
+    pending_ids, pending_skus = db.info.setdefault(_PENDING_KEY, (set(), set()))
+    pending_ids.update(product_ids)
+    pending_skus.update(skus)
+
+
+@event.listens_for(Session, "after_commit")
+def _refresh_after_commit(session: Session) -> None:
+    pending = session.info.pop(_PENDING_KEY, None)
+    if not pending:
+        return
+    pending_ids, pending_skus = pending
+    ids = product_sku_index.cached_ids(pending_ids)
+    skus = [sku for sku in pending_skus if product_sku_index.get(sku) is not None]
+    if not ids and not skus:
+        return
+    # The session cannot run SQL after its commit, so reload on a fresh connection
+    with session.get_bind().connect() as connection:
+        rows = connection.execute(
+            select(*SCAN_COLUMNS).where(models.Product.id.in_(ids) | models.Product.sku.in_(skus))
+        ).all()
+    for row in rows:
+        product_sku_index.store(row)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_after_rollback(session: Session) -> None:
+    session.info.pop(_PENDING_KEY, None)
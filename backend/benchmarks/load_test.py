@@ -0,0 +1,172 @@
+"""Load test of the sync (threadpool) and async read paths under many concurrent clients.
+
+The script serves the same crud queries two ways from one uvicorn worker:
+as sync routes on a pooled Session, which run on Starlette's threadpool, and
+as async routes on an AsyncSession. It then drives each with the same number
+of concurrent keep-alive clients for a fixed time and reports throughput and
+latency percentiles. The server runs in its own process so the client does
+not compete with it for the GIL. Auth is left out so only the database path is measured.
+
+Usage (from the backend directory, needs httpx):
+    python benchmarks/load_test.py [--clients 500] [--seconds 10]
+
+Runs against a throwaway SQLite database unless DATABASE_URL is set.
+"""
+import argparse
+import asyncio
+import multiprocessing
+import os
+import statistics
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+if "DATABASE_URL" not in os.environ:
+    os.environ["DATABASE_URL"] = f"sqlite:///{tempfile.mkdtemp()}/load_test.db"
+
+import httpx  # noqa: E402
+import uvicorn  # noqa: E402
+from fastapi import Depends, FastAPI  # noqa: E402
+from sqlalchemy.ext.asyncio import AsyncSession  # noqa: E402
+from sqlalchemy.orm import Session  # noqa: E402
+
+from app.database import Base, SessionLocal, engine, get_async_db, get_db  # noqa: E402
+from app import crud, schemas  # noqa: E402
+
+ENDPOINTS = ("products", "sales", "finance")
+
+
+def build_app() -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/sync/products", response_model=list[schemas.ProductOut])
+    def sync_products(db: Session = Depends(get_db)):
+        return crud.get_products(db, limit=50)
+
+    @app.get("/async/products", response_model=list[schemas.ProductOut])
+    async def async_products(db: AsyncSession = Depends(get_async_db)):
+        return await crud.get_products_async(db, limit=50)
+
+    @app.get("/sync/sales", response_model=list[schemas.SaleOut])
+    def sync_sales(db: Session = Depends(get_db)):
+        return crud.get_sales(db, limit=50)
+
+    @app.get("/async/sales", response_model=list[schemas.SaleOut])
+    async def async_sales(db: AsyncSession = Depends(get_async_db)):
+        return await crud.get_sales_async(db, limit=50)
+
+    @app.get("/sync/finance", response_model=schemas.FinancialSummary)
+    def sync_finance(db: Session = Depends(get_db)):
+        return crud.financial_summary(db)
+
+    @app.get("/async/finance", response_model=schemas.FinancialSummary)
+    async def async_finance(db: AsyncSession = Depends(get_async_db)):
+        return await crud.financial_summary_async(db)
+
+    return app
+
+
+def seed(products: int, sales: int) -> None:
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    crud.ensure_financial_totals(db)
+    customer = crud.create_customer(db, schemas.CustomerCreate(name="Load customer"))
+    crud.upsert_products(db, [
+        schemas.ProductCreate(name=f"Load product {i}", sku=f"LOAD-{i}", stock_qty=10 ** 6,
+                              cost_price=1, sell_price=2)
+        for i in range(products)
+    ])
+    product_ids = [p.id for p in crud.get_products(db, limit=products)]
+    crud.record_sales_bulk(db, [
+        schemas.SaleCreate(customer_id=customer.id, product_id=product_ids[i % len(product_ids)], qty=1,
+                           selling_price=2, date=date.today() - timedelta(days=i % 60))
+        for i in range(sales)
+    ])
+    db.close()
+    # The server process must not inherit pooled connections
+    engine.dispose()
+
+
+def wait_for_server(base_url: str) -> None:
+    for _ in range(200):
+        try:
+            httpx.get(f"{base_url}/docs")
+            return
+        except httpx.TransportError:
+            time.sleep(0.05)
+    raise RuntimeError("server did not start")
+
+
+async def drive(base_url: str, path: str, clients: int, seconds: float) -> dict:
+    latencies = []
+    errors = 0
+    deadline = time.perf_counter() + seconds
+    limits = httpx.Limits(max_connections=clients, max_keepalive_connections=clients)
+
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=60) as client:
+        async def worker():
+            nonlocal errors
+            while time.perf_counter() < deadline:
+                started = time.perf_counter()
+                try:
+                    response = await client.get(path)
+                    response.raise_for_status()
+                    latencies.append(time.perf_counter() - started)
+                except httpx.HTTPError:
+                    errors += 1
+
+        # Let in-flight requests finish, but give up on a server that stalls
+        tasks = [asyncio.ensure_future(worker()) for _ in range(clients)]
+        _, pending = await asyncio.wait(tasks, timeout=seconds + 60)
+        for task in pending:
+            task.cancel()
+            errors += 1
+
+    latencies.sort()
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "rps": len(latencies) / seconds,
+        "p50": statistics.median(latencies) * 1000 if latencies else 0,
+        "p99": latencies[int(len(latencies) * 0.99) - 1] * 1000 if latencies else 0,
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--clients", type=int, default=500)
+    parser.add_argument("--seconds", type=float, default=10)
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--products", type=int, default=500)
+    parser.add_argument("--sales", type=int, default=5000)
+    args = parser.parse_args()
+
+    seed(args.products, args.sales)
+    server = multiprocessing.Process(target=uvicorn.run, args=(build_app(),), kwargs={
+        "host": "127.0.0.1", "port": args.port, "log_level": "warning", "backlog": 4096
+    })
+    server.start()
+    wait_for_server(f"http://127.0.0.1:{args.port}")
+
+    base_url = f"http://127.0.0.1:{args.port}"
+    print(f"clients={args.clients} seconds={args.seconds}")
+    try:
+        for endpoint in ENDPOINTS:
+            for mode in ("sync", "async"):
+                result = asyncio.run(drive(base_url, f"/{mode}/{endpoint}", args.clients, args.seconds))
+                print(f"{endpoint:9} {mode:5} req/s={result['rps']:8.1f} p50={result['p50']:8.1f}ms "
+                      f"p99={result['p99']:8.1f}ms errors={result['errors']}")
+    finally:
+        # Stuck threadpool requests can hold up a graceful shutdown
+        server.terminate()
+        server.join(5)
+        if server.is_alive():
+            server.kill()
+            server.join()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,99 @@
+"""Latency of /api/products/search queries over a large catalog.
+
+Seeds a throwaway database with a synthetic catalog (through the same
+triggers that keep the search index in sync with product writes) and times
+crud.search_products for exact, SKU-prefix, typo and short-prefix queries.
+
+Usage (from the backend directory):
+    python benchmarks/product_search.py [--products 500000] [--repeat 50]
+
+Runs against a throwaway SQLite database unless DATABASE_URL is set.
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+if "DATABASE_URL" not in os.environ:
+    os.environ["DATABASE_URL"] = f"sqlite:///{tempfile.mkdtemp()}/product_search.db"
+
+from sqlalchemy import insert  # noqa: E402
+
+from app.database import SessionLocal, engine, Base  # noqa: E402
+from app import crud, models, search  # noqa: E402
+
+SYLLABLES = ["ba", "ko", "ri", "tu", "me", "sa", "lo", "ne", "vi", "da", "ge", "pu", "zo", "fi", "ha", "ly"]
+KNOWN_WORDS = ["copper", "bearing", "sprocket", "widget", "valve", "bracket"]
+QUERIES = {
+    "word": "sprocket",
+    "two words": "copper bearing",
+    "substring": "ocke",
+    "sku prefix": "SK-01234",
+    "sku substring": "0123456",
+    "typo": "sprokcet",
+    "short prefix": "bl",
+    "no match": "zzzz",
+}
+
+
+def _vocabulary(rng: random.Random, size: int = 5000) -> list:
+    # A few known words among thousands of made-up ones, so term frequencies
+    # look like a real catalog rather than every name sharing the same words
+    words = {"".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4))) for _ in range(size)}
+    return sorted(words) + KNOWN_WORDS
+
+
+def seed(count: int, chunk_size: int = 10000) -> None:
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    search.ensure_product_search_index(db)
+    rng = random.Random(7)
+    words = _vocabulary(rng)
+    for start in range(0, count, chunk_size):
+        db.execute(insert(models.Product), [
+            {
+                "name": f"{rng.choice(words).capitalize()} {rng.choice(words)} {rng.choice(words)}",
+                "sku": f"SK-{i:07d}",
+                "description": " ".join(rng.choice(words) for _ in range(6)),
+                "cost_price": 1,
+                "sell_price": 2,
+            }
+            for i in range(start, min(start + chunk_size, count))
+        ])
+        db.commit()
+    db.close()
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--products", type=int, default=500000)
+    parser.add_argument("--repeat", type=int, default=50)
+    parser.add_argument("--limit", type=int, default=20)
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    seed(args.products)
+    print(f"seeded {args.products} products in {time.perf_counter() - started:.1f}s")
+
+    db = SessionLocal()
+    try:
+        for label, query in QUERIES.items():
+            timings = []
+            for _ in range(args.repeat):
+                started = time.perf_counter()
+                results = crud.search_products(db, query, limit=args.limit)
+                timings.append((time.perf_counter() - started) * 1000)
+            timings.sort()
+            print(f"{label:13} q={query!r:18} hits={len(results):3} "
+                  f"p50={statistics.median(timings):7.2f}ms p99={timings[int(len(timings) * 0.99) - 1]:7.2f}ms")
+    finally:
+        db.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,125 @@
+"""Serialization time and payload size of the dashboard and sales list responses.
+
+Seeds a throwaway database, then builds the /api/analytics/dashboard and
+/api/sales?limit=100 bodies two ways: the previous path (response_model
+validation, full nested SaleOut rows and the stdlib JSONResponse) and the
+current one (ORJSONResponse, slim SaleListOut rows dumped in one pass). For
+each body it reports the time to produce it and its size raw, gzipped at the
+configured level and, when the brotli package is installed, Brotli-compressed.
+
+Usage (from the backend directory):
+    python benchmarks/response_encoding.py [--sales 5000] [--repeat 200]
+
+Runs against a throwaway SQLite database unless DATABASE_URL is set.
+"""
+import argparse
+import gzip
+import os
+import statistics
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+from typing import List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+if "DATABASE_URL" not in os.environ:
+    os.environ["DATABASE_URL"] = f"sqlite:///{tempfile.mkdtemp()}/response_encoding.db"
+
+from fastapi.responses import JSONResponse, ORJSONResponse  # noqa: E402
+from pydantic import TypeAdapter  # noqa: E402
+
+from app.config import settings  # noqa: E402
+from app.database import Base, SessionLocal, engine  # noqa: E402
+from app.fields import dump_list  # noqa: E402
+from app import crud, schemas  # noqa: E402
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+
+def seed(products: int, customers: int, sales: int) -> None:
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    crud.ensure_financial_totals(db)
+    category = crud.create_category(db, schemas.CategoryCreate(name="General", description="Everyday stock"))
+    crud.upsert_products(db, [
+        schemas.ProductCreate(name=f"Product {i}", sku=f"ENC-{i}", description=f"Catalog item number {i}",
+                              category_id=category.id, stock_qty=10 ** 6, cost_price=1, sell_price=2)
+        for i in range(products)
+    ])
+    customer_ids = [
+        crud.create_customer(db, schemas.CustomerCreate(
+            name=f"Customer {i}", email=f"customer{i}@example.com", phone="555-0100",
+            address=f"{i} Market Street"
+        )).id
+        for i in range(customers)
+    ]
+    product_ids = [p.id for p in crud.get_products(db, limit=products)]
+    crud.record_sales_bulk(db, [
+        schemas.SaleCreate(customer_id=customer_ids[i % customers], product_id=product_ids[i % products],
+                           qty=1 + i % 5, selling_price=2, date=date.today() - timedelta(days=i % 60))
+        for i in range(sales)
+    ])
+    db.close()
+
+
+def _response_model_body(response_class, model, content) -> bytes:
+    # What FastAPI does for a response_model route: validate, dump to JSON
+    # types, then render with the response class
+    adapter = TypeAdapter(model)
+    value = adapter.validate_python(content, from_attributes=True)
+    return response_class(adapter.dump_python(value, mode="json")).body
+
+
+def _time(build, repeat: int) -> tuple:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        body = build()
+        timings.append((time.perf_counter() - started) * 1000)
+    return body, statistics.median(timings)
+
+
+def _sizes(body: bytes) -> str:
+    sizes = f"raw={len(body) / 1024:7.1f}KB gzip={len(gzip.compress(body, settings.GZIP_COMPRESS_LEVEL)) / 1024:6.1f}KB"
+    if brotli is not None:
+        sizes += f" br={len(brotli.compress(body, quality=settings.BROTLI_QUALITY)) / 1024:6.1f}KB"
+    return sizes
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--products", type=int, default=200)
+    parser.add_argument("--customers", type=int, default=100)
+    parser.add_argument("--sales", type=int, default=5000)
+    parser.add_argument("--limit", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    seed(args.products, args.customers, args.sales)
+    dashboard = crud.get_dashboard_stats()
+    db = SessionLocal()
+    sales = crud.get_sales(db, limit=args.limit)
+    db.close()
+
+    cases = {
+        "dashboard before": lambda: _response_model_body(JSONResponse, schemas.DashboardStats, dashboard),
+        "dashboard after": lambda: _response_model_body(ORJSONResponse, schemas.DashboardStats, dashboard),
+        "sales before": lambda: _response_model_body(JSONResponse, List[schemas.SaleOut], sales),
+        "sales after": lambda: dump_list(sales, schemas.SaleListOut, schemas.SALE_EXPANSIONS),
+        "sales expanded": lambda: dump_list(sales, schemas.SaleListOut, schemas.SALE_EXPANSIONS,
+                                            expand="customer,product"),
+    }
+    if brotli is None:
+        print("brotli not installed, skipping Brotli sizes")
+    for label, build in cases.items():
+        body, median = _time(build, args.repeat)
+        print(f"{label:16} serialize p50={median:6.2f}ms {_sizes(body)}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
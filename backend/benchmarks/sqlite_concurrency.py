@@ -0,0 +1,130 @@
+"""Concurrent read/write throughput on SQLite, untuned vs the production profile.
+
+Reader processes poll the same queries the dashboard and list pages run while
+writer processes record sales, for a fixed time. Each profile gets a fresh
+database file; the script reports operations per second and how many
+operations failed (e.g. "database is locked").
+
+Usage (from the backend directory):
+    python benchmarks/sqlite_concurrency.py [--readers 8] [--writers 4] [--seconds 5]
+"""
+import argparse
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+from datetime import date
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy.orm import sessionmaker  # noqa: E402
+
+from app.database import Base, create_db_engine  # noqa: E402
+from app import crud, schemas  # noqa: E402
+
+PROFILES = {"untuned": False, "tuned": True}
+
+
+def _seed(session_factory, products: int) -> tuple:
+    db = session_factory()
+    crud.ensure_financial_totals(db)
+    customer_id = crud.create_customer(db, schemas.CustomerCreate(name="Bench customer")).id
+    product_ids = [
+        crud.create_product(db, schemas.ProductCreate(
+            name=f"Bench product {i}", stock_qty=10 ** 6, cost_price=1, sell_price=2
+        )).id
+        for i in range(products)
+    ]
+    db.close()
+    return customer_id, product_ids
+
+
+def _read(db) -> None:
+    crud.financial_summary(db)
+    crud.get_sales(db, limit=50)
+    crud.get_top_products(db, limit=5)
+    crud.get_low_stock_products(db)
+
+
+def _worker(url: str, tuned: bool, kind: str, worker: int, ids: tuple, deadline: float, results) -> None:
+    engine = create_db_engine(url, tuned=tuned)
+    session_factory = sessionmaker(bind=engine, autocommit=False, autoflush=False)
+    customer_id, product_ids = ids
+    done = errors = 0
+    sample = None
+    i = 0
+    while time.time() < deadline:
+        db = session_factory()
+        try:
+            if kind == "writes":
+                crud.record_sale(db, schemas.SaleCreate(
+                    customer_id=customer_id,
+                    product_id=product_ids[(worker + i) % len(product_ids)],
+                    qty=1,
+                    selling_price=2,
+                    date=date.today()
+                ))
+            else:
+                _read(db)
+            done += 1
+        except Exception as e:
+            errors += 1
+            sample = sample or repr(e)[:120]
+        finally:
+            db.close()
+        i += 1
+    engine.dispose()
+    results.put((kind, done, errors, sample))
+
+
+def run_profile(tuned: bool, readers: int, writers: int, seconds: float) -> dict:
+    # One process per worker, as with several uvicorn/gunicorn workers, so the
+    # numbers reflect database locking rather than the GIL.
+    url = f"sqlite:///{tempfile.mkdtemp()}/concurrency.db"
+    engine = create_db_engine(url, tuned=tuned)
+    Base.metadata.create_all(bind=engine)
+    ids = _seed(sessionmaker(bind=engine, autocommit=False, autoflush=False), 20)
+    engine.dispose()
+
+    results = multiprocessing.Queue()
+    deadline = time.time() + seconds
+    workers = [("reads", n) for n in range(readers)] + [("writes", n) for n in range(writers)]
+    processes = [
+        multiprocessing.Process(target=_worker, args=(url, tuned, kind, n, ids, deadline, results))
+        for kind, n in workers
+    ]
+    for process in processes:
+        process.start()
+
+    counts = {"reads": 0, "writes": 0, "errors": 0, "samples": []}
+    for _ in processes:
+        kind, done, errors, sample = results.get()
+        counts[kind] += done
+        counts["errors"] += errors
+        if sample and len(counts["samples"]) < 3:
+            counts["samples"].append(sample)
+    for process in processes:
+        process.join()
+    return counts
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--readers", type=int, default=8)
+    parser.add_argument("--writers", type=int, default=4)
+    parser.add_argument("--seconds", type=float, default=5)
+    args = parser.parse_args()
+
+    print(f"readers={args.readers} writers={args.writers} seconds={args.seconds}")
+    for name, tuned in PROFILES.items():
+        result = run_profile(tuned, args.readers, args.writers, args.seconds)
+        print(f"{name:8} reads/s={result['reads'] / args.seconds:8.1f} "
+              f"writes/s={result['writes'] / args.seconds:8.1f} errors={result['errors']}")
+        for sample in result["samples"]:
+            print(f"  {sample}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
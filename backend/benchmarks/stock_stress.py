@@ -0,0 +1,91 @@
+"""Concurrency stress check for stock decrements.
+
+Many threads sell the same product at once through crud.record_sale and the
+script checks that stock never goes negative and that every unit sold is
+accounted for.
+
+Usage (from the backend directory):
+    python benchmarks/stock_stress.py [--threads 16] [--attempts 400] [--stock 300]
+
+Runs against a throwaway SQLite database unless DATABASE_URL is set.
+"""
+import argparse
+import os
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+if "DATABASE_URL" not in os.environ:
+    os.environ["DATABASE_URL"] = f"sqlite:///{tempfile.mkdtemp()}/stock_stress.db"
+
+from app.database import SessionLocal, engine, Base  # noqa: E402
+from app import crud, models, schemas  # noqa: E402
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--threads", type=int, default=16)
+    parser.add_argument("--attempts", type=int, default=400)
+    parser.add_argument("--stock", type=int, default=300)
+    args = parser.parse_args()
+
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    crud.ensure_financial_totals(db)
+    customer = crud.create_customer(db, schemas.CustomerCreate(name="Stress customer"))
+    product = crud.create_product(db, schemas.ProductCreate(
+        name="Stress product", stock_qty=args.stock, cost_price=1, sell_price=2
+    ))
+    customer_id, product_id = customer.id, product.id
+    db.close()
+
+    sold = []
+    rejected = []
+    errors = []
+    lock = threading.Lock()
+
+    def sell(_):
+        session = SessionLocal()
+        try:
+            crud.record_sale(session, schemas.SaleCreate(
+                customer_id=customer_id, product_id=product_id, qty=1, selling_price=2, date=date.today()
+            ))
+            with lock:
+                sold.append(1)
+        except ValueError:
+            with lock:
+                rejected.append(1)
+        except Exception as e:  # e.g. lock timeouts on an untuned SQLite
+            with lock:
+                errors.append(repr(e))
+        finally:
+            session.close()
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.threads) as pool:
+        list(pool.map(sell, range(args.attempts)))
+    elapsed = time.perf_counter() - started
+
+    db = SessionLocal()
+    final_stock = db.query(models.Product.stock_qty).filter(models.Product.id == product_id).scalar()
+    recorded = db.query(models.Sale).filter(models.Sale.product_id == product_id).count()
+    db.close()
+
+    print(f"attempts={args.attempts} threads={args.threads} elapsed={elapsed:.2f}s "
+          f"({args.attempts / elapsed:.0f} sales/s)")
+    print(f"sold={len(sold)} rejected={len(rejected)} errors={len(errors)}")
+    print(f"initial_stock={args.stock} final_stock={final_stock} sale_rows={recorded}")
+    for error in errors[:5]:
+        print(f"  {error}")
+
+    consistent = final_stock >= 0 and final_stock == args.stock - len(sold) and recorded == len(sold)
+    print("OK" if consistent else "OVERSOLD OR INCONSISTENT")
+    return 0 if consistent else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,146 @@
+"""SIAMS maintenance commands.
+
+Usage:
+    python manage.py rebuild-ledger
+    python manage.py verify-ledger
+    python manage.py rebuild-rollup
+    python manage.py rebuild-search
+    python manage.py explain
+"""
+import argparse
+import sys
+from datetime import datetime, timedelta
+
+from sqlalchemy import event
+
+from app.database import SessionLocal, engine, Base
+from app import crud, search
+
+
+def rebuild_ledger(args) -> int:
+    db = SessionLocal()
+    try:
+        totals = crud.rebuild_financial_totals(db)
+        for key in crud.FINANCIAL_TOTALS_FIELDS:
+            print(f"{key}: {getattr(totals, key):.2f}")
+    finally:
+        db.close()
+    return 0
+
+
+def verify_ledger(args) -> int:
+    db = SessionLocal()
+    try:
+        drift = crud.verify_financial_totals(db)
+    finally:
+        db.close()
+
+    if not drift:
+        print("Ledger OK")
+        return 0
+    for key, values in drift.items():
+        print(f"{key}: ledger={values['ledger']} actual={values['actual']} drift={values['drift']}")
+    print("Ledger drift detected, run `python manage.py rebuild-ledger` to fix")
+    return 1
+
+
+def rebuild_rollup(args) -> int:
+    db = SessionLocal()
+    try:
+        days = crud.rebuild_daily_sales_rollup(db)
+    finally:
+        db.close()
+    print(f"Rebuilt daily sales rollup for {days} days")
+    return 0
+
+
+def rebuild_search(args) -> int:
+    db = SessionLocal()
+    try:
+        search.rebuild_product_search_index(db)
+    finally:
+        db.close()
+    print("Rebuilt product search index")
+    return 0
+
+
+def _explain_targets() -> dict:
+    week_ago = datetime.utcnow().date() - timedelta(days=7)
+    return {
+        "compute_financial_totals": lambda db: crud.compute_financial_totals(db),
+        "financial_summary": lambda db: crud.financial_summary(db),
+        "get_customer_debts": lambda db: crud.get_customer_debts(db, limit=10),
+        "get_top_products": lambda db: crud.get_top_products(db, date_from=week_ago),
+        "get_sales_trend": lambda db: crud.get_sales_trend(db),
+        "get_sales": lambda db: crud.get_sales(db),
+        "get_sales (cursor)": lambda db: crud.get_sales(
+            db, cursor=crud.encode_cursor([week_ago, 2 ** 31])
+        ),
+        "get_purchases": lambda db: crud.get_purchases(db),
+        "get_payments": lambda db: crud.get_payments(db),
+        "get_customer_payments": lambda db: crud.get_customer_payments(db, 1),
+        "get_products": lambda db: crud.get_products(db),
+        "get_low_stock_products": lambda db: crud.get_low_stock_products(db),
+        "search_products": lambda db: crud.search_products(db, "widget"),
+    }
+
+
+def explain(args) -> int:
+    statements = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            statements.append((statement, parameters))
+
+    prefix = "EXPLAIN QUERY PLAN " if engine.dialect.name == "sqlite" else "EXPLAIN "
+    db = SessionLocal()
+    try:
+        for label, target in _explain_targets().items():
+            statements.clear()
+            event.listen(engine, "before_cursor_execute", capture)
+            try:
+                target(db)
+            finally:
+                event.remove(engine, "before_cursor_execute", capture)
+
+            print(f"=== {label} ===")
+            for statement, parameters in statements:
+                print(" ".join(statement.split()))
+                plan = db.connection().exec_driver_sql(prefix + statement, parameters).fetchall()
+                for row in plan:
+                    print("    " + " | ".join(str(col) for col in row))
+            print()
+    finally:
+        db.close()
+    return 0
+
+
+COMMANDS = {
+    "rebuild-ledger": (rebuild_ledger, "Recompute running totals from the sales and purchases tables"),
+    "verify-ledger": (verify_ledger, "Report drift between running totals and the raw tables"),
+    "rebuild-rollup": (rebuild_rollup, "Recompute the daily sales rollup from the sales table"),
+    "rebuild-search": (rebuild_search, "Recreate the product search index and reindex every product"),
+    "explain": (explain, "Print the query plan of each analytics and listing query"),
+}
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="SIAMS maintenance commands")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    for name, (handler, help_text) in COMMANDS.items():
+        subparser = subparsers.add_parser(name, help=help_text)
+        subparser.set_defaults(handler=handler)
+
+    args = parser.parse_args(argv)
+    Base.metadata.create_all(bind=engine)
+    # As on app startup, so commands that search work on a fresh database
+    db = SessionLocal()
+    try:
+        search.ensure_product_search_index(db)
+    finally:
+        db.close()
+    return args.handler(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
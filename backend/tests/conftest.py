@@ -0,0 +1,33 @@
+import os
+import sys
+import tempfile
+
+# The app builds its engines from DATABASE_URL at import time, so point it at
+# a throwaway SQLite file before anything imports app.
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ["DATABASE_URL"] = f"sqlite:///{tempfile.mkdtemp()}/test.db"
+os.environ.pop("READ_DATABASE_URL", None)
+
+from datetime import datetime  # noqa: E402
+
+import pytest  # noqa: E402
+from fastapi.testclient import TestClient  # noqa: E402
+
+from app.auth import get_current_active_user, get_current_active_user_async  # noqa: E402
+from app.main import app  # noqa: E402
+from app import schemas  # noqa: E402
+
+TEST_USER = schemas.UserOut(
+    id=1, email="tests@example.com", full_name="Test User", role="admin",
+    is_active=True, created_at=datetime(2026, 1, 1)
+)
+
+
+@pytest.fixture(scope="session")
+def client():
+    # Auth is stubbed out so only the statements a route itself runs are counted
+    app.dependency_overrides[get_current_active_user] = lambda: TEST_USER
+    app.dependency_overrides[get_current_active_user_async] = lambda: TEST_USER
+    with TestClient(app) as test_client:
+        yield test_client
+    app.dependency_overrides.clear()
@@ -0,0 +1,95 @@
+from contextlib import contextmanager
+from datetime import date, timedelta
+
+import pytest
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.database import SessionLocal
+from app import crud, schemas
+
+# Statements each listing or export may run per request, whatever the number
+# of rows. Related customers, suppliers and products are joined in the main
+# query, so these stay fixed as the data grows; include_total adds one count.
+MAX_STATEMENTS = {
+    "/api/sales": 1,
+    "/api/sales?include_total=true": 2,
+    "/api/purchases": 1,
+    "/api/purchases?include_total=true": 2,
+    "/api/sales?expand=customer,product": 1,
+    "/api/purchases?expand=supplier,product": 1,
+    "/api/products": 1,
+    "/api/export/sales": 1,
+    "/api/export/purchases": 1,
+    "/api/export/inventory": 1,
+    "/api/export/debts": 1,
+}
+
+
+@contextmanager
+def count_statements():
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    # Listening on Engine covers the sync engines and the async engines'
+    # sync_engine alike
+    event.listen(Engine, "before_cursor_execute", record)
+    try:
+        yield statements
+    finally:
+        event.remove(Engine, "before_cursor_execute", record)
+
+
+def seed(count: int) -> None:
+    db = SessionLocal()
+    try:
+        category = crud.create_category(db, schemas.CategoryCreate(name=f"Category {count}"))
+        supplier = crud.create_supplier(db, schemas.SupplierCreate(name=f"Supplier {count}"))
+        customers = [crud.create_customer(db, schemas.CustomerCreate(name=f"Customer {count}-{i}")) for i in range(5)]
+        products = [
+            crud.create_product(db, schemas.ProductCreate(
+                name=f"Product {count}-{i}", category_id=category.id, stock_qty=0, cost_price=1, sell_price=2
+            ))
+            for i in range(5)
+        ]
+        for i in range(count):
+            crud.record_purchase(db, schemas.PurchaseCreate(
+                supplier_id=supplier.id, product_id=products[i % 5].id, qty=10, purchase_price=1,
+                date=date.today() - timedelta(days=i)
+            ))
+            crud.record_sale(db, schemas.SaleCreate(
+                customer_id=customers[i % 5].id, product_id=products[i % 5].id, qty=1, selling_price=2,
+                date=date.today() - timedelta(days=i)
+            ))
+    finally:
+        db.close()
+
+
+def statements_for(client, path: str) -> int:
+    with count_statements() as statements:
+        response = client.get(path)
+    assert response.status_code == 200, response.text
+    return len(statements)
+
+
+@pytest.fixture(scope="module")
+def counts(client):
+    seed(20)
+    small = {path: statements_for(client, path) for path in MAX_STATEMENTS}
+    seed(40)
+    large = {path: statements_for(client, path) for path in MAX_STATEMENTS}
+    return small, large
+
+
+@pytest.mark.parametrize("path", MAX_STATEMENTS)
+def test_statements_are_bounded(counts, path):
+    small, _ = counts
+    assert small[path] <= MAX_STATEMENTS[path]
+
+
+@pytest.mark.parametrize("path", MAX_STATEMENTS)
+def test_statements_do_not_grow_with_rows(counts, path):
+    small, large = counts
+    assert large[path] == small[path]
@@ -199,7 +199,7 @@ export default function Dashboard() {
           value={formatCurrency(financial.outstanding_receivables || 0)}
           icon={BanknotesIcon}
           color="yellow"
-          subtext={`From ${customerDebts.length} customers`}
+          subtext={`From ${data?.debtor_count ?? customerDebts.length} customers`}
         />
         <StatCard
           title="Net Profit"
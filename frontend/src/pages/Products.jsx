@@ -22,6 +22,7 @@ export default function Products() {
   const [showModal, setShowModal] = useState(false)
   const [editingProduct, setEditingProduct] = useState(null)
   const [search, setSearch] = useState('')
+  const [searchResults, setSearchResults] = useState(null)
   const [form, setForm] = useState({
     name: '',
     sku: '',
@@ -37,6 +38,25 @@ export default function Products() {
     loadData()
   }, [])
 
+  // Search runs on the server so it covers the whole catalog, not just the
+  // first page of products
+  useEffect(() => {
+    const query = search.trim()
+    if (!query) {
+      setSearchResults(null)
+      return
+    }
+    const timer = setTimeout(async () => {
+      try {
+        const res = await productsAPI.search(query)
+        setSearchResults(res.data)
+      } catch (error) {
+        toast.error('Search failed')
+      }
+    }, 250)
+    return () => clearTimeout(timer)
+  }, [search, products])
+
   const loadData = async () => {
     try {
       const [productsRes, categoriesRes] = await Promise.all([
@@ -112,11 +132,7 @@ export default function Products() {
     setEditingProduct(null)
   }
 
-  const filteredProducts = products.filter(
-    (p) =>
-      p.name.toLowerCase().includes(search.toLowerCase()) ||
-      (p.sku && p.sku.toLowerCase().includes(search.toLowerCase()))
-  )
+  const filteredProducts = searchResults ?? products
 
   if (loading) {
     return (
@@ -14,6 +14,13 @@ export default function Purchases() {
   const [loading, setLoading] = useState(true)
   const [showModal, setShowModal] = useState(false)
   const [search, setSearch] = useState('')
+  const [filters, setFilters] = useState({
+    supplier_id: '',
+    product_id: '',
+    date_from: '',
+    date_to: '',
+  })
+  const [totalCount, setTotalCount] = useState(0)
   const [form, setForm] = useState({
     supplier_id: '',
     product_id: '',
@@ -27,14 +34,38 @@ export default function Purchases() {
     loadData()
   }, [])
 
+  useEffect(() => {
+    if (!loading) loadPurchases()
+  }, [filters])
+
+  // Filters run on the server; empty values are left out of the query. The
+  // matching total is only counted when the filters change or data reloads.
+  const purchasesParams = () => ({
+    ...Object.fromEntries(Object.entries(filters).filter(([, value]) => value !== '')),
+    include_total: true,
+  })
+
+  const setPurchasesPage = (res) => {
+    setPurchases(res.data)
+    setTotalCount(Number(res.headers['x-total-count'] ?? res.data.length))
+  }
+
+  const loadPurchases = async () => {
+    try {
+      setPurchasesPage(await purchasesAPI.getAll(purchasesParams()))
+    } catch (error) {
+      toast.error(error.response?.data?.detail || 'Failed to load purchases')
+    }
+  }
+
   const loadData = async () => {
     try {
       const [purchasesRes, productsRes, suppliersRes] = await Promise.all([
-        purchasesAPI.getAll(),
+        purchasesAPI.getAll(purchasesParams()),
         productsAPI.getAll(),
         suppliersAPI.getAll(),
       ])
-      setPurchases(purchasesRes.data)
+      setPurchasesPage(purchasesRes)
       setProducts(productsRes.data)
       setSuppliers(suppliersRes.data)
     } catch (error) {
@@ -107,7 +138,7 @@ export default function Purchases() {
         </button>
       </div>
 
-      <div className="card p-4">
+      <div className="card p-4 space-y-4">
         <div className="relative">
           <MagnifyingGlassIcon className="absolute left-3 top-1/2 -translate-y-1/2 h-5 w-5 text-gray-400" />
           <input
@@ -118,6 +149,43 @@ export default function Purchases() {
             className="input pl-10"
           />
         </div>
+        <div className="grid grid-cols-2 md:grid-cols-4 gap-4">
+          <select
+            value={filters.supplier_id}
+            onChange={(e) => setFilters({ ...filters, supplier_id: e.target.value })}
+            className="input"
+          >
+            <option value="">All suppliers</option>
+            {suppliers.map((s) => (
+              <option key={s.id} value={s.id}>{s.name}</option>
+            ))}
+          </select>
+          <select
+            value={filters.product_id}
+            onChange={(e) => setFilters({ ...filters, product_id: e.target.value })}
+            className="input"
+          >
+            <option value="">All products</option>
+            {products.map((p) => (
+              <option key={p.id} value={p.id}>{p.name}</option>
+            ))}
+          </select>
+          <input
+            type="date"
+            value={filters.date_from}
+            onChange={(e) => setFilters({ ...filters, date_from: e.target.value })}
+            className="input"
+          />
+          <input
+            type="date"
+            value={filters.date_to}
+            onChange={(e) => setFilters({ ...filters, date_to: e.target.value })}
+            className="input"
+          />
+        </div>
+        <p className="text-sm text-gray-500 dark:text-gray-400">
+          Showing {filteredPurchases.length} of {totalCount} purchases
+        </p>
       </div>
 
       <div className="card overflow-hidden">
@@ -14,6 +14,14 @@ export default function Sales() {
   const [loading, setLoading] = useState(true)
   const [showModal, setShowModal] = useState(false)
   const [search, setSearch] = useState('')
+  const [filters, setFilters] = useState({
+    customer_id: '',
+    product_id: '',
+    is_fully_paid: '',
+    date_from: '',
+    date_to: '',
+  })
+  const [totalCount, setTotalCount] = useState(0)
   const [form, setForm] = useState({
     customer_id: '',
     product_id: '',
@@ -28,14 +36,38 @@ export default function Sales() {
     loadData()
   }, [])
 
+  useEffect(() => {
+    if (!loading) loadSales()
+  }, [filters])
+
+  // Filters run on the server; empty values are left out of the query. The
+  // matching total is only counted when the filters change or data reloads.
+  const salesParams = () => ({
+    ...Object.fromEntries(Object.entries(filters).filter(([, value]) => value !== '')),
+    include_total: true,
+  })
+
+  const setSalesPage = (res) => {
+    setSales(res.data)
+    setTotalCount(Number(res.headers['x-total-count'] ?? res.data.length))
+  }
+
+  const loadSales = async () => {
+    try {
+      setSalesPage(await salesAPI.getAll(salesParams()))
+    } catch (error) {
+      toast.error(error.response?.data?.detail || 'Failed to load sales')
+    }
+  }
+
   const loadData = async () => {
     try {
       const [salesRes, productsRes, customersRes] = await Promise.all([
-        salesAPI.getAll(),
+        salesAPI.getAll(salesParams()),
         productsAPI.getAll(),
         customersAPI.getAll(),
       ])
-      setSales(salesRes.data)
+      setSalesPage(salesRes)
       setProducts(productsRes.data)
       setCustomers(customersRes.data)
     } catch (error) {
@@ -111,7 +143,7 @@ export default function Sales() {
         </button>
       </div>
 
-      <div className="card p-4">
+      <div className="card p-4 space-y-4">
         <div className="relative">
           <MagnifyingGlassIcon className="absolute left-3 top-1/2 -translate-y-1/2 h-5 w-5 text-gray-400" />
           <input
@@ -122,6 +154,52 @@ export default function Sales() {
             className="input pl-10"
           />
         </div>
+        <div className="grid grid-cols-2 md:grid-cols-5 gap-4">
+          <select
+            value={filters.customer_id}
+            onChange={(e) => setFilters({ ...filters, customer_id: e.target.value })}
+            className="input"
+          >
+            <option value="">All customers</option>
+            {customers.map((c) => (
+              <option key={c.id} value={c.id}>{c.name}</option>
+            ))}
+          </select>
+          <select
+            value={filters.product_id}
+            onChange={(e) => setFilters({ ...filters, product_id: e.target.value })}
+            className="input"
+          >
+            <option value="">All products</option>
+            {products.map((p) => (
+              <option key={p.id} value={p.id}>{p.name}</option>
+            ))}
+          </select>
+          <select
+            value={filters.is_fully_paid}
+            onChange={(e) => setFilters({ ...filters, is_fully_paid: e.target.value })}
+            className="input"
+          >
+            <option value="">Any status</option>
+            <option value="true">Paid</option>
+            <option value="false">Unpaid</option>
+          </select>
+          <input
+            type="date"
+            value={filters.date_from}
+            onChange={(e) => setFilters({ ...filters, date_from: e.target.value })}
+            className="input"
+          />
+          <input
+            type="date"
+            value={filters.date_to}
+            onChange={(e) => setFilters({ ...filters, date_to: e.target.value })}
+            className="input"
+          />
+        </div>
+        <p className="text-sm text-gray-500 dark:text-gray-400">
+          Showing {filteredSales.length} of {totalCount} sales
+        </p>
       </div>
 
       <div className="card overflow-hidden">
@@ -58,6 +58,7 @@ export const categoriesAPI = {
 // Products
 export const productsAPI = {
   getAll: () => api.get('/products'),
+  search: (q, limit = 50) => api.get('/products/search', { params: { q, limit } }),
   getOne: (id) => api.get(`/products/${id}`),
   create: (data) => api.post('/products', data),
   update: (id, data) => api.put(`/products/${id}`, data),
@@ -82,14 +83,14 @@ export const customersAPI = {
 
 // Purchases
 export const purchasesAPI = {
-  getAll: () => api.get('/purchases'),
+  getAll: (params) => api.get('/purchases', { params }),
   getOne: (id) => api.get(`/purchases/${id}`),
   create: (data) => api.post('/purchases', data),
 }
 
 // Sales
 export const salesAPI = {
-  getAll: () => api.get('/sales'),
+  getAll: (params) => api.get('/sales', { params }),
   getOne: (id) => api.get(`/sales/${id}`),
   create: (data) => api.post('/sales', data),
 }